@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from pi.server import Server
+
+TARGET = 0.05
+
+
+def serve(address):
+    listener = Server(lambda command, args: None, address)
+
+    def drain():
+        while True:
+            listener.drain()
+            time.sleep(0.001)
+
+    threading.Thread(target=drain, daemon=True).start()
+    return listener
+
+
+def measure(args, env, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    address = os.path.join(tempfile.mkdtemp(), "pi.sock")
+    listener = serve(address)
+    env = {**os.environ, "PI_SOCKET": address}
+    try:
+        client = measure(["-m", "pi.client", "/tmp"], env)
+        imports = measure(["-c", "import pi.main"], env)
+    finally:
+        listener.close()
+    print(f"client     {client * 1000:8.1f}ms (target {TARGET * 1000:.0f}ms)")
+    print(f"pi.main    {imports * 1000:8.1f}ms (imports only)")
+    sys.exit(0 if client <= TARGET else 1)
@@ -0,0 +1,47 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pi.transfer import copy
+
+
+def make_tree(root, small=2000, large=4, size=64 << 20):
+    for i in range(small):
+        dir = os.path.join(root, f"d{i % 50}")
+        os.makedirs(dir, exist_ok=True)
+        with open(os.path.join(dir, f"f{i}"), "wb") as file:
+            file.write(os.urandom(4096))
+    for i in range(large):
+        with open(os.path.join(root, f"large{i}"), "wb") as file:
+            for _ in range(size >> 20):
+                file.write(os.urandom(1 << 20))
+
+
+def measure(name, function, source, target, repeat=3):
+    times = []
+    for _ in range(repeat):
+        os.sync()
+        start = time.perf_counter()
+        function(source, target)
+        times.append(time.perf_counter() - start)
+        shutil.rmtree(target)
+    print(f"{name:10} {min(times):8.3f}s")
+    return min(times)
+
+
+def legacy(source, target):
+    shutil.copytree(source, target, symlinks=True, copy_function=shutil.copy)
+
+
+if __name__ == "__main__":
+    root = tempfile.mkdtemp(dir=sys.argv[1] if len(sys.argv) > 1 else None)
+    try:
+        source = os.path.join(root, "source")
+        make_tree(source)
+        target = os.path.join(root, "target")
+        measure("shutil", legacy, source, target)
+        measure("transfer", copy, source, target)
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,281 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from pi.core import Folder
+from pi.jobs import Job
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+THRESHOLD = 0.25
+FLOOR = 0.001
+SIZES = (1000, 10000, 100000)
+
+
+def make_flat(root, count):
+    os.makedirs(root)
+    for i in range(count):
+        if i % 10 == 0:
+            os.mkdir(os.path.join(root, f"d{i:06}"))
+        else:
+            open(os.path.join(root, f"f{i:06}.txt"), "w").close()
+
+
+def make_deep(root, depth=200, width=5):
+    dir = root
+    for level in range(depth):
+        dir = os.path.join(dir, f"level{level}")
+        os.makedirs(dir)
+        for i in range(width):
+            with open(os.path.join(dir, f"f{i}"), "w") as file:
+                file.write("x" * 1024)
+
+
+def make_links(root, count=2000):
+    os.makedirs(root)
+    for i in range(count):
+        target = f"f{i}" if i % 2 else f"missing{i}"
+        if i % 2:
+            open(os.path.join(root, target), "w").close()
+        os.symlink(target, os.path.join(root, f"l{i}"))
+
+
+def make_large(root, count=4, size=32 << 20):
+    os.makedirs(root)
+    for i in range(count):
+        with open(os.path.join(root, f"large{i}"), "wb") as file:
+            for _ in range(size >> 20):
+                file.write(os.urandom(1 << 20))
+
+
+def timeit(function, repeat=5, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_folder(trees):
+    for name, root in trees.items():
+        folder = Folder(root)
+        yield f"get_files/{name}", timeit(lambda: folder.get_files(hidden=True))
+        yield f"scan/{name}", timeit(lambda: folder.scan(hidden=True))
+        files = folder.get_files(hidden=True)
+        yield f"get_file_type/{name}", timeit(
+            lambda: [folder.get_file_type(file) for file in files], repeat=3
+        )
+
+
+def bench_search(trees):
+    from pi.model import Listing
+
+    for name, root in trees.items():
+        entries = Folder(root).scan(hidden=True)
+        model = Listing(root, entries)
+        yield f"listing/{name}", timeit(lambda: Listing(root, entries))
+        yield f"search_file/{name}", timeit(lambda: model.find("zzz"))
+        yield f"select_file/{name}", timeit(lambda: model.index(entries[-1].name))
+
+
+def display():
+    import tkinter as tk
+
+    try:
+        tk.Tk().destroy()
+        return None
+    except tk.TclError:
+        pass
+    if not shutil.which("Xvfb"):
+        return False
+    server = subprocess.Popen(
+        ["Xvfb", ":99", "-screen", "0", "1920x1080x24"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.environ["DISPLAY"] = ":99"
+    for _ in range(50):
+        try:
+            tk.Tk().destroy()
+            return server
+        except tk.TclError:
+            time.sleep(0.1)
+    server.terminate()
+    return False
+
+
+def bench_load_files(trees):
+    server = display()
+    if server is False:
+        print("skipping load_files: no display and no Xvfb")
+        return
+    from pi.main import App
+
+    app = App()
+    try:
+        for name, root in trees.items():
+            tab = app.new_tab(root)
+            box = app.get_box(tab)
+
+            def load():
+                app.load_files(box, root, focus=False)
+                app.update_idletasks()
+
+            yield f"load_files/warm/{name}", timeit(load)
+            yield f"load_files/cold/{name}", timeit(
+                load, setup=lambda: app.cache.invalidate(root)
+            )
+    finally:
+        app.destroy()
+        if server:
+            server.terminate()
+
+
+def bench_jobs(trees, scratch):
+    for name in ("flat-1000", "deep", "links", "large"):
+        if name not in trees:
+            continue
+        source = trees[name]
+        target = os.path.join(scratch, name)
+
+        def paste():
+            Job("copy", [(source, target)]).run()
+
+        def delete():
+            Job("delete", [(target, None)]).run()
+
+        def restore():
+            copy(source, target)
+
+        yield f"paste/{name}", timeit(paste, repeat=3, setup=lambda: remove(target))
+        yield f"delete/{name}", timeit(delete, repeat=3, setup=restore)
+        remove(target)
+
+
+def remove(path):
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def copy(source, target):
+    remove(target)
+    shutil.copytree(source, target, symlinks=True)
+
+
+def bench_ipc(scratch, count=1000):
+    from pi.client import Connection
+    from pi.server import Server
+
+    address = os.path.join(scratch, "pi.sock")
+    listener = Server(lambda command, args: args, address)
+    running = threading.Event()
+    running.set()
+
+    def drain():
+        while running.is_set():
+            listener.drain()
+            time.sleep(0.0005)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    try:
+        with Connection(address) as connection:
+            yield f"ipc/round-trip-{count}", timeit(
+                lambda: [connection.request("list-tabs") for _ in range(count)]
+            )
+
+            def pipelined():
+                ids = [connection.send("list-tabs") for _ in range(count)]
+                for id in ids:
+                    connection.receive(id)
+
+            yield f"ipc/pipelined-{count}", timeit(pipelined)
+    finally:
+        running.clear()
+        thread.join()
+        listener.close()
+
+
+def build(root, sizes, large):
+    trees = {}
+    for size in sizes:
+        trees[f"flat-{size}"] = os.path.join(root, f"flat-{size}")
+        make_flat(trees[f"flat-{size}"], size)
+    trees["deep"] = os.path.join(root, "deep")
+    make_deep(trees["deep"])
+    trees["links"] = os.path.join(root, "links")
+    make_links(trees["links"])
+    if large:
+        trees["large"] = os.path.join(root, "large")
+        make_large(trees["large"])
+    return trees
+
+
+def compare(results, baseline, threshold, floor=FLOOR):
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            status = "new"
+        elif seconds > base * (1 + threshold) and seconds - base > floor:
+            status = f"SLOWER {seconds / base:.2f}x"
+            regressions.append(name)
+        else:
+            status = f"{seconds / base:.2f}x"
+        print(f"{name:32} {seconds * 1000:10.3f}ms  {status}")
+    return regressions
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark pi hot paths")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--floor", type=float, default=FLOOR)
+    parser.add_argument("--save", action="store_true", help="write results as baseline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--no-large", dest="large", action="store_false")
+    parser.add_argument("--no-gui", dest="gui", action="store_false")
+    parser.add_argument("--dir", help="where to create the synthetic trees")
+    options = parser.parse_args(args)
+
+    root = tempfile.mkdtemp(dir=options.dir)
+    try:
+        trees = build(os.path.join(root, "trees"), options.sizes, options.large)
+        scratch = os.path.join(root, "scratch")
+        os.mkdir(scratch)
+        listings = {name: path for name, path in trees.items() if name != "deep"}
+        results = {}
+        results.update(bench_folder(listings))
+        results.update(bench_search(listings))
+        if options.gui:
+            results.update(bench_load_files(listings))
+        results.update(bench_jobs(trees, scratch))
+        results.update(bench_ipc(scratch))
+    finally:
+        shutil.rmtree(root)
+
+    try:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+    except (OSError, ValueError):
+        baseline = {}
+    regressions = compare(results, baseline, options.threshold, options.floor)
+    if options.save:
+        with open(options.baseline, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {options.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regressions over {options.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
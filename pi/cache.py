@@ -0,0 +1,89 @@
+import threading
+
+from collections import OrderedDict
+
+from pi.core import Folder
+from pi.watch import watcher
+
+
+class Cache:
+    def __init__(self, shown=set, capacity=64, interval=2):
+        self.shown = shown
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.listings = OrderedDict()
+        self.dirty = set()
+        self.generations = {}
+        self.watcher = watcher(self.mark, interval)
+
+    def get(self, dir):
+        with self.lock:
+            if dir in self.listings:
+                self.listings.move_to_end(dir)
+                return self.listings[dir]
+        self.watcher.watch(dir)
+        generation = self.generations.get(dir)
+        entries = Folder(dir).scan(hidden=True)
+        with self.lock:
+            if generation == self.generations.get(dir):
+                self.listings[dir] = entries
+        self.evict()
+        return entries
+
+    def peek(self, dir):
+        with self.lock:
+            return self.listings.get(dir)
+
+    def seed(self, dir, entries):
+        with self.lock:
+            self.listings.setdefault(dir, entries)
+
+    def revalidate(self, dir):
+        self.watcher.watch(dir)
+        generation = self.generations.get(dir)
+        try:
+            entries = Folder(dir).scan(hidden=True)
+        except OSError:
+            self.mark(dir)
+            raise
+        with self.lock:
+            if generation != self.generations.get(dir):
+                return
+            if self.listings.get(dir) == entries:
+                return
+            self.listings[dir] = entries
+            self.dirty.add(dir)
+
+    def mark(self, dir):
+        with self.lock:
+            self.listings.pop(dir, None)
+            self.dirty.add(dir)
+            self.bump(dir)
+        self.watcher.unwatch(dir)
+
+    def invalidate(self, *dirs):
+        for dir in dirs:
+            with self.lock:
+                self.listings.pop(dir, None)
+                self.bump(dir)
+            self.watcher.unwatch(dir)
+
+    def bump(self, dir):
+        self.generations[dir] = self.generations.get(dir, 0) + 1
+
+    def changes(self):
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def evict(self):
+        if len(self.listings) <= self.capacity:
+            return
+        shown = self.shown()
+        with self.lock:
+            stale = [dir for dir in self.listings if dir not in shown]
+            stale = stale[:len(self.listings) - self.capacity]
+            for dir in stale:
+                del self.listings[dir]
+        for dir in stale:
+            self.watcher.unwatch(dir)
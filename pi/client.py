@@ -0,0 +1,86 @@
+import os
+import socket
+import sys
+
+from pi.protocol import HEADER, ProtocolError, decode, encode, parse
+
+SOCKET_PATH = os.environ.get("PI_SOCKET", "/tmp/pi.sock")
+TIMEOUT = 5
+
+
+class Connection:
+    def __init__(self, address=SOCKET_PATH, timeout=TIMEOUT):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        try:
+            self.socket.connect(address)
+        except OSError:
+            self.socket.close()
+            raise
+        self.id = 0
+        self.replies = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.socket.close()
+
+    def send(self, command, *args):
+        self.id += 1
+        self.socket.sendall(encode(self.id, command, *args))
+        return self.id
+
+    def read(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.socket.recv(size - len(data))
+            if not chunk:
+                raise ProtocolError("connection closed")
+            data += chunk
+        return data
+
+    def receive(self, id):
+        while id not in self.replies:
+            reply, length = parse(self.read(HEADER.size))
+            self.replies[reply] = decode(self.read(length))
+        status, *fields = self.replies.pop(id)
+        if status != "ok":
+            raise ProtocolError(fields[0] if fields else status)
+        return fields
+
+    def request(self, command, *args):
+        return self.receive(self.send(command, *args))
+
+
+def forward(paths, address=SOCKET_PATH, timeout=TIMEOUT):
+    try:
+        connection = Connection(address, timeout)
+    except OSError:
+        return False
+    with connection:
+        try:
+            connection.request("batch-open", *paths)
+        except TimeoutError:
+            raise ProtocolError("running instance is not responding")
+    return True
+
+
+def main(args):
+    paths = [os.path.abspath(os.path.expanduser(arg)) for arg in args]
+    try:
+        if forward(paths):
+            if not paths:
+                print("already running")
+            return
+    except ProtocolError as e:
+        sys.exit(f"pi: {e}")
+    python = sys.executable
+    os.execl(python, python, "-m", "pi.main", *paths)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -5,12 +5,17 @@ class config:
         geometry = "1920x1080"
         bg = "#ffffff"
         font = ("Cantarell", 12)
+        prewarm = True
+        live_tabs = 12
+        live_rows = 200000
 
     class console:
         input_bg = "#ffffff"
         input_select_bg = "#d3d3d3"
         output_bg = "#ffffff"
         output_select_bg = "#d3d3d3"
+        interval = 16
+        scrollback = 10000
 
     class explorer:
         bg = "#ffffff"
@@ -20,3 +25,61 @@ class config:
         executable_fg = "#009e60"
         active_link_fg = "#008b8b"
         broken_link_fg = "#888888"
+        sort = "name"
+        reverse = False
+        dirs_first = False
+        filter_budget = 0.008
+
+    class editor:
+        window = 2000
+        margin = 50
+        sync = 2000
+        tags = {
+            "comment": "#888888",
+            "string": "#008b00",
+            "number": "#aa5500",
+            "keyword": "#0033bb",
+            "definition": "#aa00aa",
+        }
+
+    class preview:
+        enabled = False
+        width = 80
+        capacity = 16 << 20
+        limit = 65536
+        lines = 200
+        prefetch = 2
+        interval = 30
+
+    class cache:
+        capacity = 64
+        interval = 250
+        poll = 2
+
+    class jobs:
+        workers = 4
+        per_device = 1
+        interval = 200
+
+    class usage:
+        workers = 8
+        nodes = 100000
+        interval = 100
+
+    class grep:
+        workers = None
+        interval = 100
+
+    class instrument:
+        enabled = False
+        interval = 50
+        threshold = 0.2
+
+    class session:
+        interval = 1000
+        rows = 20000
+
+    class index:
+        ignore = {
+            ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", ".cache"
+        }
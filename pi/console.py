@@ -1,4 +1,8 @@
+import ctypes
+import queue
+import threading
 import tkinter as tk
+import traceback
 
 from tkinter import simpledialog, ttk
 
@@ -7,9 +11,44 @@ from pi.core import exec_with_return
 from pi.utils import restart
 
 
+class Buffer:
+    def __init__(self, limit=10000):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.chunks = []
+        self.lines = 0
+
+    def write(self, text):
+        with self.lock:
+            self.chunks.append(text)
+            self.lines += text.count("\n")
+            if self.lines > 2 * self.limit:
+                self.trim()
+        return len(text)
+
+    def trim(self):
+        text = "".join(self.chunks)
+        start = len(text)
+        for _ in range(self.limit + 1):
+            start = text.rfind("\n", 0, start)
+            if start < 0:
+                break
+        self.chunks = [text[start + 1:]]
+        self.lines = min(self.lines, self.limit)
+
+    def take(self):
+        with self.lock:
+            if self.lines > self.limit:
+                self.trim()
+            text = "".join(self.chunks)
+            self.chunks = []
+            self.lines = 0
+        return text
+
+
 class Console:
     def __init__(self, parent, prompt):
-        self.buffer = str()
+        self.buffer = Buffer(config.console.scrollback)
         self.prompt = prompt
         self.frame = ttk.Frame(parent)
         self.output = tk.Text(self.frame, state=tk.DISABLED, height=10)
@@ -21,12 +60,23 @@ class Console:
         self.input.bind("<Control-l>", self.clear)
         self.frame.bind("<Enter>", lambda event: self.input.focus_set())
         self.input.bind("<Return>", self.execute)
+        self.input.bind("<Escape>", self.interrupt)
         self.button = ttk.Button(self.frame, text="Restart", command=restart)
         self.button.pack(side=tk.RIGHT, padx=4)
         self.button = ttk.Button(self.frame, text="Clear", command=self.clear)
         self.button.pack(side=tk.RIGHT, padx=4)
+        self.button = ttk.Button(self.frame, text="Stop", command=self.interrupt)
+        self.button.pack(side=tk.RIGHT, padx=4)
         self.apply_theme()
         self.locals = {}
+        self.commands = queue.SimpleQueue()
+        self.running = None
+        self.interrupted = False
+        self.shown = None
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self.work, daemon=True)
+        self.worker.start()
+        self.frame.after(config.console.interval, self.poll)
 
     def apply_theme(self):
         self.output.config(
@@ -39,19 +89,74 @@ class Console:
         )
 
     def write(self, message):
+        return self.buffer.write(message)
+
+    def flush(self):
+        pass
+
+    def show(self, text):
+        following = self.output.yview()[1] >= 1
         self.output.config(state=tk.NORMAL)
-        self.output.insert(tk.END, message)
-        self.output.see(tk.END)
+        self.output.insert(tk.END, text)
+        lines = int(self.output.index("end-1c").split(".")[0])
+        if lines > config.console.scrollback:
+            self.output.delete("1.0", f"{lines - config.console.scrollback + 1}.0")
         self.output.config(state=tk.DISABLED)
+        if following:
+            self.output.see(tk.END)
+
+    def poll(self):
+        text = self.buffer.take()
+        if text:
+            self.show(text)
+        if self.running != self.shown:
+            self.shown = self.running
+            self.label.config(text="Running" if self.running else "Python")
+        self.frame.after(config.console.interval, self.poll)
 
     def execute(self, event=None):
         command = self.input.get().strip()
         self.input.delete(0, tk.END)
         if command:
             self.write(self.prompt + command + "\n")
-            result = exec_with_return(command, globals(), self.locals)
-            if result is not None:
-                self.write(str(result) + "\n")
+            self.commands.put(command)
+
+    def work(self):
+        while True:
+            try:
+                self.serve()
+            except KeyboardInterrupt:
+                self.finish()
+
+    def serve(self):
+        while True:
+            self.running = self.commands.get()
+            try:
+                result = exec_with_return(self.running, globals(), self.locals)
+                if result is not None:
+                    self.write(str(result) + "\n")
+            except KeyboardInterrupt:
+                self.write("KeyboardInterrupt\n")
+            except Exception:
+                self.write(traceback.format_exc())
+            self.finish()
+
+    def finish(self):
+        with self.lock:
+            self.running = None
+            self.interrupted = False
+            self.raise_in_worker(None)
+
+    def interrupt(self, event=None):
+        with self.lock:
+            if self.running and not self.interrupted:
+                self.interrupted = True
+                self.raise_in_worker(ctypes.py_object(KeyboardInterrupt))
+
+    def raise_in_worker(self, exception):
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(
+            ctypes.c_ulong(self.worker.ident), exception
+        )
 
     def clear(self, event=None):
         self.output.config(state=tk.NORMAL)
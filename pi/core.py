@@ -1,26 +1,78 @@
 import ast
+import copy
 import os
+import stat
 
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
 
 from pi.utils import cd
 
 
-def exec_with_return(code, globals, locals):
+class Load(ast.NodeTransformer):
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        if hasattr(node, "ctx"):
+            node.ctx = ast.Load()
+        return node
+
+
+@lru_cache(maxsize=256)
+def compile_command(code):
     a = ast.parse(code)
     last_expression = None
     if a.body:
         if isinstance(a_last := a.body[-1], ast.Expr):
-            last_expression = ast.unparse(a.body.pop())
+            last_expression = a.body.pop().value
         elif isinstance(a_last, ast.Assign):
-            last_expression = ast.unparse(a_last.targets[0])
+            last_expression = a_last.targets[0]
         elif isinstance(a_last, (ast.AnnAssign, ast.AugAssign)):
-            last_expression = ast.unparse(a_last.target)
-    exec(ast.unparse(a), globals, locals)
+            last_expression = a_last.target
+    body = compile(a, "<console>", "exec")
+    if last_expression is None:
+        return body, None
+    expression = ast.Expression(Load().visit(copy.deepcopy(last_expression)))
+    return body, compile(ast.fix_missing_locations(expression), "<console>", "eval")
+
+
+def exec_with_return(code, globals, locals):
+    body, last_expression = compile_command(code)
+    exec(body, globals, locals)
     if last_expression:
         return eval(last_expression, globals, locals)
 
 
+Entry = namedtuple("Entry", "name type link dir executable size mtime ino")
+
+
+def visible(name, hidden=False, pattern=None):
+    if not hidden and name.startswith("."):
+        return False
+    if pattern and pattern not in name:
+        return False
+    return True
+
+
+def make_entry(entry):
+    info = entry.stat(follow_symlinks=False)
+    target, type = info, None
+    link = stat.S_ISLNK(info.st_mode)
+    if link:
+        try:
+            target, type = entry.stat(), "active_link"
+        except OSError:
+            type = "broken_link"
+    dir = stat.S_ISDIR(target.st_mode)
+    executable = not dir and bool(target.st_mode & 0o111)
+    if not type:
+        type = "folder" if dir else "executable" if executable else "file"
+    return Entry(
+        entry.name, type, link, dir, executable,
+        target.st_size, target.st_mtime, info.st_ino
+    )
+
+
 class Folder():
     def __init__(self, dir):
         self.dir = dir
@@ -38,26 +90,31 @@ class Folder():
 
     def get_files(self, hidden=False, pattern=None):
         files = sorted(os.listdir(self.dir))
-        final = []
-        for file in files:
-            if not hidden and file.startswith("."):
-                continue
-            if pattern and pattern not in file:
-                continue
-            final.append(file)
-        return final
+        return [file for file in files if visible(file, hidden, pattern)]
 
     def get_file_type(self, file):
-        with cd(self.dir):
-            if os.path.islink(file):
-                if os.path.exists(file):
-                    return "active_link"
-                else:
-                    return "broken_link"
         path = os.path.join(self.dir, file)
+        if os.path.islink(path):
+            if os.path.exists(path):
+                return "active_link"
+            else:
+                return "broken_link"
         if os.path.isdir(path):
             return "folder"
         elif os.access(path, os.X_OK):
             return "executable"
         else:
             return "file"
+
+    def scan(self, hidden=False, pattern=None):
+        entries = []
+        with os.scandir(self.dir) as it:
+            for entry in it:
+                if not visible(entry.name, hidden, pattern):
+                    continue
+                try:
+                    entries.append(make_entry(entry))
+                except OSError:
+                    continue
+        entries.sort(key=lambda entry: entry.name)
+        return entries
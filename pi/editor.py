@@ -1,11 +1,194 @@
 #!/usr/bin/env python
 
+import os
 import tkinter as tk
 
+from tkinter import ttk
+
+from pi.config import config
+from pi.highlight import LEXERS, Highlighter
+from pi.piece import PieceTable
+
+ENCODING = "utf-8"
+ERRORS = "surrogateescape"
+PROXY = """
+proc {widget} args {{
+    lassign [{widget}_dispatch {{*}}$args] code result
+    return -code $code $result
+}}
+"""
+
 
 class Editor(tk.Frame):
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, path=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.pack(expand=True, fill=tk.BOTH)
-        self.editor = tk.Text(self, bd=0, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.editor = tk.Text(self, bd=0, highlightthickness=0, undo=False)
+        self.editor.config(yscrollcommand=self.scrolled)
         self.editor.pack(expand=True, fill=tk.BOTH)
+        for tag, color in config.editor.tags.items():
+            self.editor.tag_configure(tag, foreground=color)
+        self.original = f"{self.editor}_original"
+        self.tk.call("rename", str(self.editor), self.original)
+        self.tk.createcommand(f"{self.editor}_dispatch", self.dispatch)
+        self.tk.eval(PROXY.format(widget=self.editor))
+        self.table = PieceTable()
+        self.path = None
+        self.saved = 0
+        self.first = 0
+        self.pending = None
+        self.highlighter = None
+        self.painting = None
+        if path:
+            self.open(path)
+
+    def destroy(self):
+        name = str(self.editor)
+        super().destroy()
+        self.tk.call("rename", name, "")
+        self.tk.deletecommand(f"{name}_dispatch")
+
+    def call(self, *args):
+        return self.tk.call(self.original, *args)
+
+    def dispatch(self, operation, *args):
+        try:
+            if operation == "edit" and args[:1] in (("undo",), ("redo",)):
+                return "ok", self.restore(args[0])
+            if operation in ("insert", "delete", "replace"):
+                return "ok", self.change(operation, *args)
+            return "ok", self.call(operation, *args)
+        except tk.TclError as e:
+            return "error", str(e)
+
+    def change(self, operation, *args):
+        line = min(self.position(args[0])[0], self.position("end-1c")[0])
+        start = self.offset(args[0])
+        if operation == "insert":
+            end, text = start, "".join(args[1::2])
+        else:
+            end = self.offset(args[1] if len(args) > 1 else f"{args[0]}+1c")
+            text = "".join(args[2::2]) if operation == "replace" else ""
+        removed = self.table.read(start, end).count(b"\n") if end > start else 0
+        result = self.call(operation, *args)
+        self.table.delete(start, end)
+        self.table.insert(start, text.encode(ENCODING, ERRORS))
+        if self.highlighter:
+            self.highlighter.edit(line, removed, text.count("\n"))
+            self.repaint()
+        return result
+
+    def offset(self, index):
+        index = self.call("index", index)
+        if self.tk.getboolean(self.call("compare", index, ">", "end-1c")):
+            index = self.call("index", "end-1c")
+        line = int(str(index).split(".")[0])
+        prefix = self.call("get", f"{line}.0", index)
+        start = self.table.line_offset(self.first + line - 1)
+        return start + len(prefix.encode(ENCODING, ERRORS))
+
+    def position(self, index):
+        line, column = map(int, str(self.call("index", index)).split("."))
+        return self.first + line - 1, column
+
+    def line(self, line):
+        start = self.table.line_offset(line)
+        if start is None:
+            return None
+        end = self.table.line_offset(line + 1)
+        return self.table.read(start, end).decode(ENCODING, ERRORS).removesuffix("\n")
+
+    def open(self, path):
+        self.table = PieceTable.open(path)
+        self.path = path
+        lexer = LEXERS.get(os.path.splitext(path)[1])
+        self.highlighter = lexer and Highlighter(lexer, config.editor.sync)
+        self.saved = self.table.version
+        self.show(0)
+
+    def save(self, path=None):
+        path = path or self.path
+        self.table.save(path)
+        self.path = path
+        self.saved = self.table.version
+
+    def modified(self):
+        return self.table.version != self.saved
+
+    def show(self, top=0, insert=None):
+        window = config.editor.window
+        if self.table.line_offset(top) is None:
+            top = self.table.line_of(len(self.table))
+        self.first = max(0, top - window // 2)
+        start = self.table.line_offset(self.first)
+        end = self.table.line_offset(self.first + window)
+        text = self.table.read(start, end).decode(ENCODING, ERRORS)
+        self.call("delete", "1.0", "end")
+        self.call("insert", "1.0", text)
+        line, column = insert or (top, 0)
+        self.call("mark", "set", "insert", f"{line - self.first + 1}.{column}")
+        self.call("yview", f"{top - self.first + 1}.0")
+        self.call("see", "insert")
+        if self.highlighter:
+            self.repaint()
+
+    def repaint(self):
+        if not self.painting:
+            self.painting = self.after_idle(self.paint)
+
+    def paint(self):
+        self.painting = None
+        margin = config.editor.margin
+        top = self.position("@0,0")[0]
+        bottom = self.position(f"@0,{self.editor.winfo_height()}")[0]
+        lo = max(self.first, top - margin)
+        hi = min(self.position("end-1c")[0], bottom + margin)
+        ranges = {tag: [] for tag in config.editor.tags}
+        for line, tag, start, end in self.highlighter.highlight(lo, hi, self.line):
+            row = line - self.first + 1
+            ranges[tag] += (f"{row}.{start}", f"{row}.{end}")
+        start, end = f"{lo - self.first + 1}.0", f"{hi - self.first + 2}.0"
+        for tag, indices in ranges.items():
+            self.call("tag", "remove", tag, start, end)
+            if indices:
+                self.call("tag", "add", tag, *indices)
+
+    def restore(self, operation):
+        position = getattr(self.table, operation)()
+        if position is None:
+            return ""
+        line = self.table.line_of(position)
+        if self.highlighter:
+            self.highlighter.invalidate(line)
+        prefix = self.table.read(self.table.line_offset(line), position)
+        top = self.position("@0,0")[0]
+        if abs(line - top) > config.editor.window // 4:
+            top = line
+        self.show(top, (line, len(prefix.decode(ENCODING, ERRORS))))
+        return ""
+
+    def scrolled(self, lo, hi):
+        lines = self.position("end-1c")[0] - self.first + 1
+        total = max(self.table.line_count(), self.first + lines)
+        lo, hi = self.first + float(lo) * lines, self.first + float(hi) * lines
+        self.scrollbar.set(lo / total, hi / total)
+        if self.highlighter:
+            self.repaint()
+        margin = config.editor.window // 4
+        top, bottom = lo - self.first, hi - self.first
+        after = self.offset("end-1c") < len(self.table)
+        if (top < margin and self.first) or (bottom > lines - margin and after):
+            if not self.pending:
+                self.pending = self.after_idle(self.recenter)
+
+    def recenter(self):
+        self.pending = None
+        self.show(self.position("@0,0")[0], self.position("insert"))
+
+    def scroll(self, *args):
+        if args[0] == "moveto":
+            self.show(int(float(args[1]) * self.table.line_count()))
+        else:
+            self.editor.yview(*args)
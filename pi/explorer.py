@@ -0,0 +1,304 @@
+import tkinter as tk
+
+from tkinter import font
+
+
+class Explorer(tk.Listbox):
+    def __init__(self, parent, overscan=20, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.items = []
+        self.colors = []
+        self.labels = {}
+        self.selected = set()
+        self.active = 0
+        self.anchor = 0
+        self.top = 0
+        self.start = 0
+        self.end = 0
+        self.overscan = overscan
+        linespace = font.Font(font=self.cget("font")).metrics("linespace")
+        self.line = linespace + 2 * self.pixels("selectborderwidth")
+        self.border = 2 * (self.pixels("bd") + self.pixels("highlightthickness"))
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.bindtags((str(self), "Explorer", str(self.winfo_toplevel()), "all"))
+        self.bind("<Configure>", lambda event: self.render())
+        if not self.bind_class("Explorer"):
+            bind_class(self)
+
+    def pixels(self, option):
+        return self.winfo_pixels(self.cget(option))
+
+    def rows(self):
+        return max(1, (self.winfo_height() - self.border) // self.line)
+
+    def set_items(self, items, colors=None):
+        self.items = list(items)
+        self.colors = list(colors) if colors else [None] * len(self.items)
+        self.labels = {}
+        self.selected.clear()
+        self.active = self.anchor = self.top = 0
+        self.render(force=True)
+
+    def render(self, force=False):
+        rows = self.rows()
+        size = len(self.items)
+        self.top = max(0, min(self.top, size - rows))
+        covered = self.start <= self.top and min(self.top + rows, size) <= self.end
+        if force or not covered:
+            self.start = max(0, self.top - self.overscan)
+            self.end = min(size, self.top + rows + self.overscan)
+            tk.Listbox.delete(self, 0, tk.END)
+            tk.Listbox.insert(self, tk.END, *(
+                self.labels.get(index, self.items[index])
+                for index in range(self.start, self.end)
+            ))
+            for index in range(self.start, self.end):
+                if self.colors[index]:
+                    tk.Listbox.itemconfig(
+                        self, index - self.start, {"fg": self.colors[index]}
+                    )
+            self.render_selection()
+        tk.Listbox.yview(self, self.top - self.start)
+        self.scrollbar.set(*self.yview())
+
+    def relabel(self, labels):
+        self.labels = dict(labels)
+        self.render(force=True)
+
+    def render_selection(self):
+        tk.Listbox.selection_clear(self, 0, tk.END)
+        first = last = None
+        for index in sorted(i for i in self.selected if self.start <= i < self.end):
+            if last is not None and index == last + 1:
+                last = index
+                continue
+            if first is not None:
+                tk.Listbox.selection_set(self, first - self.start, last - self.start)
+            first = last = index
+        if first is not None:
+            tk.Listbox.selection_set(self, first - self.start, last - self.start)
+
+    def index(self, index):
+        size = len(self.items)
+        if index in (tk.ACTIVE, "active"):
+            return self.active
+        if index in (tk.END, "end"):
+            return size
+        if isinstance(index, str) and index.startswith("@"):
+            return self.nearest(int(index[1:].split(",")[1]))
+        index = int(index)
+        return max(0, min(index, size - 1)) if size else 0
+
+    def span(self, first, last=None):
+        first = min(self.index(first), len(self.items) - 1)
+        if last is None:
+            return range(first, first + 1)
+        last = len(self.items) - 1 if last in (tk.END, "end") else self.index(last)
+        return range(first, last + 1)
+
+    def size(self):
+        return len(self.items)
+
+    def get(self, first, last=None):
+        if last is None:
+            return self.items[self.index(first)]
+        return tuple(self.items[i] for i in self.span(first, last))
+
+    def insert(self, index, *elements, colors=None):
+        if isinstance(index, int):
+            index = max(0, min(index, len(self.items)))
+        else:
+            index = self.index(index)
+        count = len(elements)
+        colors = list(colors) if colors else [None] * count
+        self.items[index:index] = elements
+        self.colors[index:index] = colors
+
+        def shift(i):
+            return i + count if i >= index else i
+
+        self.selected = {shift(i) for i in self.selected}
+        self.labels = {shift(i): label for i, label in self.labels.items()}
+        if len(self.items) > count:
+            self.active, self.anchor = shift(self.active), shift(self.anchor)
+        if index < self.top:
+            self.top += count
+        window = self.rows() + 2 * self.overscan
+        if index < self.start:
+            self.start += count
+            self.end += count
+        elif index < self.end or (index == self.end and self.end - self.start < window):
+            if self.end - self.start + count > 2 * window:
+                self.end += count
+                self.render(force=True)
+                return
+            row = index - self.start
+            tk.Listbox.insert(self, row, *elements)
+            for offset, color in enumerate(colors):
+                if color:
+                    tk.Listbox.itemconfig(self, row + offset, {"fg": color})
+            self.end += count
+            self.render_selection()
+        self.render()
+
+    def delete(self, first, last=None):
+        span = self.span(first, last)
+        if not span:
+            return
+        count = len(span)
+        del self.items[span.start:span.stop]
+        del self.colors[span.start:span.stop]
+
+        def shift(i):
+            return i - count if i >= span.stop else i
+
+        def moved(i):
+            return span.start if i in span else shift(i)
+
+        self.selected = {shift(i) for i in self.selected if i not in span}
+        self.labels = {
+            shift(i): label for i, label in self.labels.items() if i not in span
+        }
+        last = max(len(self.items) - 1, 0)
+        self.active = min(moved(self.active), last)
+        self.anchor = min(moved(self.anchor), last)
+        self.top -= len(range(span.start, min(span.stop, self.top)))
+        first, stop = max(span.start, self.start), min(span.stop, self.end)
+        if first < stop:
+            tk.Listbox.delete(self, first - self.start, stop - 1 - self.start)
+        self.start -= len(range(span.start, min(span.stop, self.start)))
+        self.end -= count - len(range(max(span.start, self.end), span.stop))
+        self.render()
+
+    def itemconfig(self, index, cnf=None, **kw):
+        index = self.index(index)
+        self.colors[index] = {**(cnf or {}), **kw}.get("fg", self.colors[index])
+        if self.start <= index < self.end:
+            tk.Listbox.itemconfig(self, index - self.start, {"fg": self.colors[index]})
+
+    itemconfigure = itemconfig
+
+    def curselection(self):
+        return tuple(sorted(self.selected))
+
+    def selection_includes(self, index):
+        return self.index(index) in self.selected
+
+    def selection_set(self, first, last=None):
+        if self.items:
+            self.selected.update(self.span(first, last))
+            self.render_selection()
+
+    def selection_clear(self, first, last=None):
+        self.selected.difference_update(self.span(first, last))
+        self.render_selection()
+
+    select_set = selection_set
+    select_clear = selection_clear
+    select_includes = selection_includes
+
+    def activate(self, index):
+        self.active = self.index(index)
+
+    def nearest(self, y):
+        row = tk.Listbox.nearest(self, y)
+        return min(self.start + max(row, 0), max(len(self.items) - 1, 0))
+
+    def see(self, index):
+        index = self.index(index)
+        rows = self.rows()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + rows:
+            self.top = index - rows + 1
+        self.render()
+
+    def yview(self, *args):
+        size = len(self.items)
+        if not args:
+            if not size:
+                return 0.0, 1.0
+            return self.top / size, min(1.0, (self.top + self.rows()) / size)
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * size)
+        elif args[0] == "scroll":
+            step = self.rows() if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        else:
+            self.top = self.index(args[0])
+        self.render()
+
+    def yview_moveto(self, fraction):
+        self.yview("moveto", fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview("scroll", number, what)
+
+    def move(self, delta, extend=False):
+        if not self.items:
+            return
+        self.active = max(0, min(self.active + delta, len(self.items) - 1))
+        if extend:
+            self.selected = set(
+                range(min(self.anchor, self.active), max(self.anchor, self.active) + 1)
+            )
+        else:
+            self.selected = {self.active}
+            self.anchor = self.active
+        self.see(self.active)
+        self.render_selection()
+        self.event_generate("<<ListboxSelect>>")
+
+    def click(self, y, mode=None):
+        self.focus_set()
+        index = self.nearest(y)
+        if not self.items:
+            return
+        if mode == "toggle":
+            self.selected.symmetric_difference_update({index})
+            self.anchor = index
+        elif mode == "extend":
+            self.selected = set(
+                range(min(self.anchor, index), max(self.anchor, index) + 1)
+            )
+        else:
+            self.selected = {index}
+            self.anchor = index
+        self.active = index
+        self.render_selection()
+        self.event_generate("<<ListboxSelect>>")
+
+
+def bind_class(widget):
+    def page(event, sign, extend=False):
+        event.widget.move(sign * event.widget.rows(), extend)
+
+    def wheel(event, units):
+        event.widget.yview_scroll(units, "units")
+
+    bindings = {
+        "<Up>": lambda e: e.widget.move(-1),
+        "<Down>": lambda e: e.widget.move(1),
+        "<Shift-Up>": lambda e: e.widget.move(-1, True),
+        "<Shift-Down>": lambda e: e.widget.move(1, True),
+        "<Prior>": lambda e: page(e, -1),
+        "<Next>": lambda e: page(e, 1),
+        "<Shift-Prior>": lambda e: page(e, -1, True),
+        "<Shift-Next>": lambda e: page(e, 1, True),
+        "<Home>": lambda e: e.widget.move(-len(e.widget.items)),
+        "<End>": lambda e: e.widget.move(len(e.widget.items)),
+        "<Shift-Home>": lambda e: e.widget.move(-len(e.widget.items), True),
+        "<Shift-End>": lambda e: e.widget.move(len(e.widget.items), True),
+        "<Control-slash>": lambda e: e.widget.selection_set(0, tk.END),
+        "<Control-backslash>": lambda e: e.widget.selection_clear(0, tk.END),
+        "<Button-1>": lambda e: e.widget.click(e.y),
+        "<Shift-Button-1>": lambda e: e.widget.click(e.y, "extend"),
+        "<Control-Button-1>": lambda e: e.widget.click(e.y, "toggle"),
+        "<B1-Motion>": lambda e: e.widget.click(e.y, "extend"),
+        "<MouseWheel>": lambda e: wheel(e, -1 if e.delta > 0 else 1),
+        "<Button-4>": lambda e: wheel(e, -3),
+        "<Button-5>": lambda e: wheel(e, 3),
+    }
+    for sequence, handler in bindings.items():
+        widget.bind_class("Explorer", sequence, handler)
@@ -0,0 +1,165 @@
+import mmap
+import multiprocessing
+import os
+import re
+import stat
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from queue import SimpleQueue
+
+from pi.text import binary
+
+BATCH = 64
+CHUNK = 4 << 20
+WIDTH = 200
+
+
+def compile_pattern(query):
+    if len(query) > 1 and query.startswith("/") and query.endswith("/"):
+        query = query[1:-1]
+    else:
+        query = re.escape(query)
+    flags = re.MULTILINE | (re.IGNORECASE if query.islower() else 0)
+    return query, flags
+
+
+def grep_file(path, pattern, limit=1000):
+    matches = []
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return matches
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if binary(data):
+                return matches
+            line, counted = 1, 0
+            for match in pattern.finditer(data):
+                start = data.rfind(b"\n", 0, match.start()) + 1
+                if matches and start <= counted:
+                    continue
+                line += data[counted:start].count(b"\n")
+                counted = start
+                end = data.find(b"\n", match.end())
+                end = len(data) if end < 0 else end
+                text = data[start:min(end, start + WIDTH)]
+                matches.append((path, line, text.decode(errors="replace").rstrip()))
+                if len(matches) >= limit:
+                    break
+    return matches
+
+
+def grep_batch(paths, query, flags):
+    pattern = re.compile(query.encode(errors="surrogateescape"), flags)
+    matches = []
+    for path in paths:
+        try:
+            matches.extend(grep_file(path, pattern))
+        except (OSError, ValueError):
+            pass
+    return matches
+
+
+class Grep:
+    def __init__(self, workers=None, ignore=(), hidden=False):
+        self.workers = workers
+        self.ignore = ignore
+        self.hidden = hidden
+        self.executor = None
+        self.search = None
+
+    def start(self, root, query):
+        if self.search:
+            self.search.cancel()
+        if not self.executor:
+            context = multiprocessing.get_context("spawn")
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=context)
+        self.search = Search(self, root, query)
+        threading.Thread(target=self.search.run, daemon=True).start()
+        return self.search
+
+    def cancel(self):
+        if self.search:
+            self.search.cancel()
+            self.search = None
+
+    def skip(self, name):
+        return name in self.ignore or (not self.hidden and name.startswith("."))
+
+
+class Search:
+    def __init__(self, grep, root, query):
+        self.grep = grep
+        self.root = root
+        self.query, self.flags = compile_pattern(query)
+        re.compile(self.query, self.flags)
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.futures = set()
+        self.walking = True
+        self.results = SimpleQueue()
+
+    def run(self):
+        batch, size = [], 0
+        try:
+            for path, info in self.walk():
+                if self.cancelled.is_set():
+                    return
+                batch.append(path)
+                size += info.st_size
+                if len(batch) >= BATCH or size >= CHUNK:
+                    self.submit(batch)
+                    batch, size = [], 0
+            if batch:
+                self.submit(batch)
+        finally:
+            with self.lock:
+                self.walking = False
+                done = not self.futures
+            if done:
+                self.results.put(None)
+
+    def walk(self):
+        stack = [self.root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            dirs = []
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if self.grep.skip(entry.name):
+                    continue
+                try:
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(info.st_mode):
+                    dirs.append(entry.path)
+                elif stat.S_ISREG(info.st_mode):
+                    yield entry.path, info
+            stack.extend(reversed(dirs))
+
+    def submit(self, batch):
+        future = self.grep.executor.submit(grep_batch, batch, self.query, self.flags)
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(self.collect)
+
+    def collect(self, future):
+        if not future.cancelled() and not future.exception():
+            matches = future.result()
+            if matches and not self.cancelled.is_set():
+                self.results.put(matches)
+        with self.lock:
+            self.futures.discard(future)
+            done = not self.walking and not self.futures
+        if done:
+            self.results.put(None)
+
+    def cancel(self):
+        self.cancelled.set()
+        with self.lock:
+            futures = list(self.futures)
+        for future in futures:
+            future.cancel()
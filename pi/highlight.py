@@ -0,0 +1,92 @@
+import keyword
+import re
+
+TOKEN = re.compile(
+    r"(?P<comment>#.*)"
+    r"|(?P<string>[rRbBuUfF]{0,2}(?:\"\"\"|'''|\"(?:[^\"\\]|\\.)*\"?|'(?:[^'\\]|\\.)*'?))"
+    r"|(?P<number>\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*(?:\.\d*)?(?:[eE][-+]?\d+)?j?)\b)"
+    rf"|(?P<keyword>\b(?:{'|'.join(keyword.kwlist)})\b)"
+    r"|(?P<definition>(?<=\bdef )\w+|(?<=\bclass )\w+)"
+)
+
+
+def lex(line, state=""):
+    tokens = []
+    position = 0
+    if state:
+        close = line.find(state)
+        if close < 0:
+            return [("string", 0, len(line))], state
+        position = close + 3
+        tokens.append(("string", 0, position))
+    while match := TOKEN.search(line, position):
+        kind = match.lastgroup
+        start, position = match.span()
+        delimiter = match.group()[-3:]
+        if kind == "string" and delimiter in ('"""', "'''"):
+            close = line.find(delimiter, position)
+            if close < 0:
+                tokens.append((kind, start, len(line)))
+                return tokens, delimiter
+            position = close + 3
+        tokens.append((kind, start, position))
+    return tokens, ""
+
+
+LEXERS = {".py": lex, ".pyw": lex, ".pyi": lex}
+
+
+class Highlighter:
+    def __init__(self, lexer=lex, sync=2000):
+        self.lexer = lexer
+        self.sync = sync
+        self.states = [""]
+        self.known = 0
+        self.stale = None
+
+    def edit(self, line, removed, added):
+        shift = added - removed
+        self.states[line + 1:line + 1 + removed] = [None] * added
+        lo, hi, reach = self.stale or (line, line, self.known)
+        hi = hi + shift if hi > line else hi
+        reach = reach + shift if reach > line + removed else min(reach, line)
+        self.stale = (min(lo, line), max(hi, line + added), reach)
+        self.known = min(self.known, line)
+
+    def invalidate(self, line):
+        del self.states[line + 1:]
+        self.known = min(self.known, line)
+        self.stale = None
+
+    def highlight(self, lo, hi, text):
+        start = min(lo, self.known)
+        if lo - start > self.sync:
+            start = lo
+        state = self.states[start] if start < len(self.states) else None
+        tokens = []
+        for line in range(start, hi + 1):
+            content = text(line)
+            if content is None:
+                break
+            found, state = self.lexer(content, state or "")
+            if line >= lo:
+                tokens.extend((line, *token) for token in found)
+            self.advance(line, state)
+        return tokens
+
+    def advance(self, line, state):
+        states = self.states
+        if len(states) <= line + 1:
+            states.extend([None] * (line + 2 - len(states)))
+        stale = self.stale
+        if stale and line >= stale[1]:
+            if line == self.known and states[line + 1] == state:
+                self.known = max(line + 1, min(stale[2], len(states) - 1))
+                self.stale = None
+                return
+            if line >= self.known:
+                self.stale = (stale[0], line + 1, stale[2])
+        if line >= self.known:
+            states[line + 1] = state
+        if line == self.known:
+            self.known += 1
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import pickle
+import re
+import threading
+
+from pathlib import Path
+
+from pi.text import fold
+
+INDEX = Path.home() / ".cache" / "pi" / "index"
+
+
+class Index:
+    def __init__(self, root, path=None, ignore=(), hidden=False):
+        self.root = root
+        key = hashlib.sha1(os.fsencode(root)).hexdigest()
+        self.path = Path(path) if path else INDEX / key
+        self.ignore = ignore
+        self.hidden = hidden
+        self.lock = threading.Lock()
+        self.dirs = {}
+        self.blob = ""
+        self.folded = ""
+        self.last = None
+        self.version = 0
+        self.thread = None
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as file:
+                dirs = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+        with self.lock:
+            self.dirs = dirs
+        self.build()
+        return True
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        with open(temp, "wb") as file:
+            pickle.dump(self.dirs, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, self.path)
+
+    def skip(self, name):
+        return name in self.ignore or (not self.hidden and name.startswith("."))
+
+    def update(self):
+        dirs = {}
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.root, rel)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = self.dirs.get(rel)
+            if cached and cached[0] == mtime:
+                files, subdirs = cached[1], cached[2]
+            else:
+                files, subdirs = scan(path, self.skip)
+            dirs[rel] = (mtime, files, subdirs)
+            stack.extend(os.path.join(rel, name) for name in subdirs)
+        with self.lock:
+            self.dirs = dirs
+        self.build()
+
+    def build(self):
+        paths = []
+        for rel, (mtime, files, subdirs) in self.dirs.items():
+            paths.extend(os.path.join(rel, name) + "/" for name in subdirs)
+            paths.extend(os.path.join(rel, name) for name in files)
+        blob = "\n".join(paths)
+        with self.lock:
+            self.blob, self.folded = blob, fold(blob)
+            self.version += 1
+
+    def refresh(self):
+        if not self.dirs:
+            self.load()
+        self.update()
+        self.save()
+
+    def start(self):
+        if not self.thread or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.refresh, daemon=True)
+            self.thread.start()
+
+    def search(self, query, limit=100, candidates=20000):
+        query = query.lower()
+        with self.lock:
+            blob, folded = self.blob, self.folded
+        if not query:
+            return blob.split("\n", limit)[:limit] if blob else []
+        source = blob
+        last = self.last
+        if last and last[1] is blob and query.startswith(last[0]):
+            blob, folded = last[2], last[3]
+        pattern = re.compile(
+            re.escape(query[0])
+            + "".join(f"[^\n{re.escape(c)}]*{re.escape(c)}" for c in query[1:])
+        )
+        lines = []
+        position = 0
+        while len(lines) < candidates:
+            match = pattern.search(folded, position)
+            if not match:
+                break
+            start = folded.rfind("\n", 0, match.start()) + 1
+            end = folded.find("\n", match.end())
+            end = len(folded) if end < 0 else end
+            lines.append(blob[start:end])
+            position = end + 1
+        if len(lines) < candidates:
+            narrowed = "\n".join(lines)
+            self.last = (query, source, narrowed, fold(narrowed))
+        lines.sort(key=lambda line: score(line.lower(), query))
+        return lines[:limit]
+
+    def resolve(self, path):
+        return os.path.join(self.root, path.rstrip("/"))
+
+
+def scan(path, skip):
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if skip(entry.name):
+                    continue
+                try:
+                    dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    dir = False
+                (subdirs if dir else files).append(entry.name)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def score(path, query):
+    name = path.rstrip("/").rsplit("/", 1)[-1]
+    if name.startswith(query):
+        rank = 0
+    elif query in name:
+        rank = 1
+    elif query in path:
+        rank = 2
+    elif subsequence(query, name):
+        rank = 3
+    else:
+        rank = 4
+    return rank, path.count("/"), len(path)
+
+
+def subsequence(query, text):
+    it = iter(text)
+    return all(c in it for c in query)
@@ -0,0 +1,167 @@
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+import tkinter
+import traceback
+import types
+
+from pathlib import Path
+
+LOG = Path.home() / ".cache" / "pi" / "stalls.log"
+BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BOUNDS + (self.max,), self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+            "buckets": dict(zip([str(b) for b in BOUNDS] + ["inf"], self.counts)),
+        }
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.current = None
+        self.stalls = []
+
+    def record(self, name, seconds):
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].record(seconds)
+
+    def summary(self):
+        with self.lock:
+            return {name: h.summary() for name, h in self.histograms.items()}
+
+    def report(self, limit=20):
+        rows = sorted(self.summary().items(), key=lambda item: -item[1]["max"])
+        lines = [f"{'handler':40} {'count':>7} {'mean':>9} {'p95':>9} {'max':>9}"]
+        for name, s in rows[:limit]:
+            lines.append(
+                f"{name[:40]:40} {s['count']:7} {s['mean'] * 1000:8.1f}ms"
+                f" {s['p95'] * 1000:8.1f}ms {s['max'] * 1000:8.1f}ms"
+            )
+        return "\n".join(lines)
+
+    def export(self, path):
+        with open(path, "w") as file:
+            report = {"handlers": self.summary(), "stalls": self.stalls}
+            json.dump(report, file, indent=2)
+        return path
+
+
+def describe(func):
+    name = getattr(func, "__name__", None) or repr(func)
+    if name == "<lambda>":
+        code = func.__code__
+        return f"lambda {os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    if "callit" in getattr(func, "__qualname__", ""):
+        return f"after {name}"
+    owner = getattr(func, "__self__", None)
+    if owner is None or isinstance(owner, types.ModuleType):
+        return name
+    return f"{type(owner).__name__}.{name}"
+
+
+def install(stats):
+    class CallWrapper(tkinter.CallWrapper):
+        def __init__(self, func, subst, widget):
+            super().__init__(func, subst, widget)
+            self.name = describe(func)
+
+        def __call__(self, *args):
+            outer = stats.current
+            stats.current = self.name
+            start = time.perf_counter()
+            try:
+                return super().__call__(*args)
+            finally:
+                stats.record(self.name, time.perf_counter() - start)
+                stats.current = outer
+
+    tkinter.CallWrapper = CallWrapper
+    return stats
+
+
+class Watchdog:
+    def __init__(self, widget, stats, interval=50, threshold=0.2, log=LOG):
+        self.widget = widget
+        self.stats = stats
+        self.interval = interval
+        self.threshold = threshold
+        self.log = log
+        self.ident = threading.get_ident()
+        self.beat = self.expected = time.monotonic()
+        self.stalled = False
+        self.widget.after(self.interval, self.tick)
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def tick(self):
+        now = time.monotonic()
+        self.stats.record("after lag", max(0, now - self.expected))
+        self.beat = now
+        self.expected = now + self.interval / 1000
+        self.widget.after(self.interval, self.tick)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval / 1000)
+            blocked = time.monotonic() - self.beat
+            if blocked < self.threshold:
+                self.stalled = False
+            elif not self.stalled:
+                self.stalled = True
+                self.dump(blocked)
+
+    def dump(self, blocked):
+        frame = sys._current_frames().get(self.ident)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        stall = {
+            "time": time.time(),
+            "blocked": blocked,
+            "handler": self.stats.current,
+            "stack": stack,
+        }
+        self.stats.stalls.append(stall)
+        text = (
+            f"Tk loop blocked for {blocked:.2f}s in {stall['handler']}\n{stack}"
+        )
+        print(text, file=sys.__stderr__)
+        if self.log:
+            try:
+                os.makedirs(os.path.dirname(self.log), exist_ok=True)
+                with open(self.log, "a") as file:
+                    file.write(text + "\n")
+            except OSError:
+                pass
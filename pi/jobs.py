@@ -0,0 +1,210 @@
+import errno
+import os
+import stat
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pi import transfer
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind, items):
+        self.kind = kind
+        self.items = items
+        self.status = "queued"
+        self.error = None
+        self.files_total = self.bytes_total = 0
+        self.files_done = self.bytes_done = 0
+        self.started = self.finished = None
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.touched = set()
+        for source, target in items:
+            self.touched.add(os.path.dirname(target or source))
+            if kind in ("move", "delete"):
+                self.touched.add(os.path.dirname(source))
+
+    def __str__(self):
+        names = ", ".join(os.path.basename(source) for source, _ in self.items)
+        return f"{self.kind.capitalize()} {names}"
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise Cancelled()
+
+    def advance(self, files=0, bytes=0):
+        with self.lock:
+            self.files_done += files
+            self.bytes_done += bytes
+
+    def elapsed(self):
+        if not self.started:
+            return 0
+        return (self.finished or time.monotonic()) - self.started
+
+    def throughput(self):
+        elapsed = self.elapsed()
+        return self.bytes_done / elapsed if elapsed else 0
+
+    def eta(self):
+        throughput = self.throughput()
+        if not throughput:
+            return None
+        return (self.bytes_total - self.bytes_done) / throughput
+
+    def fraction(self):
+        if self.bytes_total:
+            return self.bytes_done / self.bytes_total
+        if self.files_total:
+            return self.files_done / self.files_total
+        return 0
+
+    def devices(self):
+        devices = set()
+        for source, target in self.items:
+            paths = [source, os.path.dirname(target)] if target else [source]
+            for path in paths:
+                try:
+                    devices.add(os.lstat(path).st_dev)
+                except OSError:
+                    pass
+        return devices
+
+    def measure(self, path, recursive=True):
+        files, bytes = measure(path, recursive)
+        self.files_total += files
+        self.bytes_total += bytes
+
+    def run(self):
+        self.status = "running"
+        self.started = time.monotonic()
+        try:
+            for source, _ in self.items:
+                self.measure(source, self.kind in ("copy", "delete"))
+            operation = OPERATIONS[self.kind]
+            for source, target in self.items:
+                self.check()
+                operation(self, source, target)
+            self.status = "done"
+        except Cancelled:
+            self.status = "cancelled"
+        except OSError as e:
+            self.status = "failed"
+            self.error = e
+        finally:
+            self.finished = time.monotonic()
+
+
+def measure(path, recursive=True):
+    info = os.lstat(path)
+    if not recursive or not stat.S_ISDIR(info.st_mode):
+        return 1, info.st_size if stat.S_ISREG(info.st_mode) else 0
+    files, bytes = 1, 0
+    with os.scandir(path) as it:
+        for entry in it:
+            f, b = measure(entry.path)
+            files += f
+            bytes += b
+    return files, bytes
+
+
+def copy(job, source, target):
+    transfer.copy(source, target, job.advance, job.check)
+
+
+def delete(job, source, target=None, advance=True):
+    job.check()
+    info = os.lstat(source)
+    if stat.S_ISDIR(info.st_mode):
+        with os.scandir(source) as it:
+            for entry in it:
+                delete(job, entry.path, advance=advance)
+        os.rmdir(source)
+    else:
+        os.remove(source)
+    if advance:
+        job.advance(1, info.st_size if stat.S_ISREG(info.st_mode) else 0)
+
+
+def move(job, source, target):
+    try:
+        os.rename(source, target)
+        job.advance(files=1)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    files, bytes = measure(source, recursive=False)
+    job.files_total -= files
+    job.bytes_total -= bytes
+    job.measure(source)
+    copy(job, source, target)
+    delete(job, source, advance=False)
+
+
+def link(job, source, target):
+    os.symlink(os.path.relpath(source, os.path.dirname(target)), target)
+    job.advance(files=1)
+
+
+OPERATIONS = {"copy": copy, "move": move, "link": link, "delete": delete}
+
+
+class Queue:
+    def __init__(self, workers=4, per_device=1):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="pi-job")
+        self.per_device = per_device
+        self.lock = threading.Lock()
+        self.semaphores = {}
+        self.jobs = []
+
+    def submit(self, job):
+        with self.lock:
+            self.jobs.append(job)
+        self.executor.submit(self.run, job)
+        return job
+
+    def semaphore(self, device):
+        with self.lock:
+            if device not in self.semaphores:
+                self.semaphores[device] = threading.Semaphore(self.per_device)
+            return self.semaphores[device]
+
+    def run(self, job):
+        held = []
+        try:
+            for device in sorted(job.devices()):
+                semaphore = self.semaphore(device)
+                while not semaphore.acquire(timeout=0.1):
+                    job.check()
+                held.append(semaphore)
+            job.run()
+        except Cancelled:
+            job.status = "cancelled"
+            job.finished = time.monotonic()
+        finally:
+            for semaphore in held:
+                semaphore.release()
+
+    def active(self):
+        with self.lock:
+            return [job for job in self.jobs if job.status in ("queued", "running")]
+
+    def finished(self):
+        with self.lock:
+            done = [job for job in self.jobs if job.status not in ("queued", "running")]
+            self.jobs = [job for job in self.jobs if job not in done]
+        return done
+
+    def cancel(self):
+        for job in self.active():
+            job.cancel()
@@ -1,5 +1,6 @@
 #!../.venv/bin/python
 
+import sys
 import tkinter as tk
 
 from tkinter import ttk
@@ -30,8 +31,8 @@ if __name__ == "__main__":
     frame.bottom.config(state="normal")
     frame.bottom.insert("1.0", "1,1  Mouse")
     frame.bottom.config(state="disabled")
-    window = Editor(frame.body)
-    lines = ["Hello, world!", str(), "Thanks for using Pi. Have a great day!"]
-    for line in lines:
-        window.editor.insert(tk.END, line + "\n")
+    window = Editor(frame.body, path=sys.argv[1] if len(sys.argv) > 1 else None)
+    if not window.path:
+        lines = ["Hello, world!", str(), "Thanks for using Pi. Have a great day!"]
+        window.editor.insert(tk.END, "\n".join(lines) + "\n")
     root.mainloop()
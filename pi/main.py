@@ -1,41 +1,83 @@
 import os
-import shutil
+import re
 import subprocess
 import sys
+import threading
 import tkinter as tk
 
+from collections import OrderedDict
 from pathlib import Path
-from tkinter import filedialog, Listbox, Menu, messagebox, simpledialog, ttk
+from tkinter import filedialog, Menu, messagebox, simpledialog, ttk
 
-from pi import server
+from pi import client, instrument, server, session
+from pi.cache import Cache
 from pi.config import config
 from pi.console import Console
-from pi.core import Folder
+from pi.core import visible
+from pi.explorer import Explorer
+from pi.grep import Grep
+from pi.index import Index
+from pi.jobs import Job, Queue
+from pi.model import Filter, Listing, SORTS, diff, sort
+from pi.picker import Picker
+from pi.preview import Previews
+from pi.progress import Progress
+from pi.protocol import ProtocolError
+from pi.results import Results
 from pi.tab import Tab
 from pi.tray import Tray
-from pi.utils import quit, restart, save_state, load_state
+from pi.usage import Usage
+from pi.utils import format_size, quit, restart
 
 
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
+        self.stats = None
+        if config.instrument.enabled or os.environ.get("PI_INSTRUMENT"):
+            self.stats = instrument.install(instrument.Stats())
+            settings = config.instrument
+            instrument.Watchdog(self, self.stats, settings.interval, settings.threshold)
         self.data = {}
+        self.tabs_by_dir = {}
+        self.query = None
+        self.arrivals = {}
         self.show_hidden = False
+        self.indexes = {}
+        self.usage = Usage(config.usage.workers, config.usage.nodes)
+        self.grep = Grep(config.grep.workers, config.index.ignore)
+        self.results = None
+        self.previews = Previews(
+            config.preview.capacity, config.preview.limit, config.preview.lines
+        )
+        self.preview = None
+        self.wanted = None
+        self.polling = None
+        self.session = session.Writer(rows=config.session.rows)
+        self.signature = None
+        self.recent = OrderedDict()
+        self.cache = Cache(self.live_dirs, config.cache.capacity, config.cache.poll)
         self.bindings = [
             ("↑/↓", "Move", None),
             ("←/→", "Parent / Open", None),
             ("Return", "Open", None),
-            ("!", "Filter", self.filter_files),
+            ("!", "Filter (fuzzy, glob*, /regex)", self.filter_files),
             ("*", "Executable", self.make_executable),
-            ("/", "Search", self.search_file),
+            ("/", "Search (^prefix, /regex/)", self.search_file),
             ("`", "Dup tab", self.duplicate_tab),
             ("e", "Edit", self.edit_file),
+            ("g", "Grep", self.grep_files),
             ("h", "Help", self.show_help),
             ("l", "Link", self.create_links),
             ("n", "New file", self.create_file),
             ("o", "New folder", self.create_folder),
+            ("p", "Preview", self.toggle_preview),
             ("q", "Close/Quit", self.close_tab),
             ("Q", "Force quit", None),
+            ("S", "Sort mode", self.cycle_sort),
+            ("R", "Reverse sort", self.reverse_sort),
+            ("D", "Directories first", self.toggle_dirs_first),
+            ("U", "Disk usage", self.toggle_usage),
             ("s", "Terminal", self.open_terminal),
             ("x", "Fuzzy open local", self.fuzzy_open_local),
             ("X", "Fuzzy open global", self.fuzzy_open_global),
@@ -43,6 +85,7 @@ class App(tk.Tk):
             ("Z", "Fuzzy edit global", self.fuzzy_edit_global),
             ("Del", "Delete", None),
             ("F2", "Rename", None),
+            ("F3", "Repeat find", None),
             ("F5", "Refresh", None),
             ("Ctrl+c/x/v", "Copy/Cut/Paste", None),
         ]
@@ -52,26 +95,140 @@ class App(tk.Tk):
         self.option_add("*Font", config.app.font)
         self.tab = Tab(self)
         self.tab.pack(fill=tk.BOTH, expand=True)
+        self.tab.bind("<<NotebookTabChanged>>", lambda event: self.tab_activated())
+        if config.preview.enabled:
+            self.toggle_preview()
         self.menu = Menu(self, tearoff=0)
+        self.sort_menu = Menu(self.menu, tearoff=0)
+        for mode in SORTS:
+            self.sort_menu.add_command(
+                label=mode.capitalize(),
+                command=lambda mode=mode: self.resort(mode=mode),
+            )
+        self.sort_menu.add_separator()
+        self.sort_menu.add_command(label="Reverse", command=self.reverse_sort)
+        self.sort_menu.add_command(
+            label="Directories First", command=self.toggle_dirs_first
+        )
+        self.jobs = Queue(config.jobs.workers, config.jobs.per_device)
+        self.progress = Progress(
+            self, self.jobs, self.job_finished, config.jobs.interval
+        )
         # self.create_console()
-        self.new_tab(os.getcwd())
-
-    def load_files(self, box, dir, pattern=None, selection=None):
-        box.delete(0, tk.END)
-        box.insert(tk.END, "..")
-        folder = Folder(dir)
-        position = 0
-        for index, file in enumerate(folder.get_files(self.show_hidden, pattern)):
-            box.insert(tk.END, file)
-            attr = f"{folder.get_file_type(file)}_fg"
-            box.itemconfig(tk.END, {"fg": getattr(config.explorer, attr)})
-            if selection and file == selection:
-                position = index
-        box.selection_set(position + 1)
-        box.activate(position + 1)
-        box.focus_set()
-
-    def new_tab(self, path):
+        self.after(config.cache.interval, self.watch_changes)
+        self.after(config.session.interval, self.save_session)
+        self.after(config.usage.interval, self.poll_usage)
+
+    def load_files(self, box, dir, selection=None, focus=True):
+        entries = self.cache.get(dir)
+        entries = [e for e in entries if visible(e.name, self.show_hidden)]
+        self.show_files(box, dir, entries, selection, focus)
+
+    def show_files(self, box, dir, entries, selection=None, focus=True, rescan=True):
+        tab = str(box.master)
+        data = self.data[tab]
+        entries = data["entries"] = sort(entries, **data["sort"])
+        data["colors"] = [color(entry) for entry in entries]
+        indices = self.narrow(tab)
+        self.display(tab, dir, indices, selection, focus)
+        if data["usage"] and rescan:
+            self.scan_usage(tab)
+
+    def narrow(self, tab, budget=None):
+        data = self.data[tab]
+        if not data["query"]:
+            return range(len(data["entries"]))
+        matcher = data["matcher"]
+        if not matcher or matcher.entries is not data["entries"]:
+            matcher = data["matcher"] = Filter(data["entries"])
+        try:
+            return matcher.match(data["query"], budget)
+        except re.error:
+            return range(len(data["entries"]))
+
+    def display(self, tab, dir, indices, selection=None, focus=True):
+        data = self.data[tab]
+        box = data["box"]
+        entries, colors = data["entries"], data["colors"]
+        if not isinstance(indices, range):
+            entries = [entries[index] for index in indices]
+            colors = [colors[index] for index in indices]
+        model = data["model"] = Listing(dir, entries)
+        position = model.index(selection) if selection else None
+        position = 1 if position is None else position
+        box.set_items(model.names, [None] + colors)
+        box.selection_set(position)
+        box.activate(position)
+        box.see(position)
+        if focus:
+            box.focus_set()
+        if data["totals"]:
+            self.show_usage(tab)
+        self.preview_file()
+
+    def reload_files(self, box, dir, *changed, focus=None):
+        self.cache.invalidate(dir, *changed)
+        self.update_files(box, dir, focus)
+
+    def update_files(self, box, dir, focus=None):
+        tab = str(box.master)
+        data = self.data[tab]
+        model = data["model"]
+        if not model or model.dir != dir:
+            self.load_files(box, dir, focus, focus=False)
+            return
+        entries = self.cache.get(dir)
+        entries = [e for e in entries if visible(e.name, self.show_hidden)]
+        data["entries"] = sort(entries, **data["sort"])
+        data["colors"] = [color(entry) for entry in data["entries"]]
+        entries = [data["entries"][index] for index in self.narrow(tab)]
+        deletes, inserts, updates = diff(model.entries, entries)
+        for start, stop in reversed(deletes):
+            box.delete(start + 1, stop)
+        for start, stop in inserts:
+            added = entries[start:stop]
+            box.insert(
+                start + 1, *(e.name for e in added), colors=[color(e) for e in added]
+            )
+        for index in updates:
+            entry = entries[index]
+            if color(entry) != color(model.entries[model.index(entry.name) - 1]):
+                box.itemconfig(index + 1, fg=color(entry))
+        model = data["model"] = Listing(dir, entries)
+        index = model.index(focus) if focus else None
+        if index is not None:
+            self.focus_index(box, index)
+        elif box.size() and not box.curselection():
+            box.selection_set(tk.ACTIVE)
+        if data["totals"]:
+            self.show_usage(tab)
+        self.after_idle(self.hibernate_tabs)
+
+    def watch_changes(self):
+        for dir in self.cache.changes():
+            focus = self.arrivals.pop(dir, None)
+            for tab in self.tabs_by_dir.get(dir, ()):
+                box = self.data[tab]["box"]
+                if not box:
+                    continue
+                try:
+                    self.update_files(box, dir, focus)
+                except OSError:
+                    pass
+        self.after(config.cache.interval, self.watch_changes)
+
+    def job_finished(self, job):
+        for dir in job.touched:
+            self.cache.mark(dir)
+        for source, target in job.items:
+            if target and job.status == "done":
+                self.arrivals[os.path.dirname(target)] = os.path.basename(target)
+        if job.error:
+            print(f"{job} failed: {job.error}")
+        else:
+            print(f"{job} {job.status}")
+
+    def new_tab(self, path, lazy=False):
         frame = ttk.Frame(self.tab)
         tab = str(frame)
         try:
@@ -81,14 +238,31 @@ class App(tk.Tk):
         self.tab.add(frame, text=os.path.basename(path) or path)
         self.tab.insert(index, frame, text=os.path.basename(path) or path)
         self.tab.select(frame)
-        box = Listbox(frame, selectmode="extended", activestyle="none")
+        self.data[tab] = {
+            "dir": None, "frame": frame, "box": None, "model": None,
+            "entries": [], "colors": [],
+            "sort": {
+                "mode": config.explorer.sort,
+                "reverse": config.explorer.reverse,
+                "dirs_first": config.explorer.dirs_first,
+            },
+            "query": None, "matcher": None, "bar": None, "filtering": None,
+            "usage": False, "scan": None, "totals": {},
+        }
+        self.set_dir(tab, path)
+        if not lazy:
+            self.build_tab(tab)
+        return tab
+
+    def build_tab(self, tab):
+        data = self.data[tab]
+        box = Explorer(data["frame"], selectmode="extended", activestyle="none")
         box.config(bg=config.explorer.bg, selectbackground=config.explorer.select_bg)
         box.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
-        scrollbar = tk.Scrollbar(box, orient=tk.VERTICAL)
-        scrollbar.config(command=box.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        box.config(yscrollcommand=scrollbar.set)
-        self.data[tab] = {"dir": path, "frame": frame, "box": box}
+        data["box"] = box
+        self.recent[tab] = None
+        self.recent.move_to_end(tab)
+        self.after_idle(self.hibernate_tabs)
         box.bind("!", self.filter_files)
         box.bind("*", self.make_executable)
         box.bind("/", self.search_file)
@@ -105,6 +279,7 @@ class App(tk.Tk):
         box.bind("<Enter>", lambda event: self.tab_activated())
         box.bind("<Escape>", self.hide_menu)
         box.bind("<F2>", self.rename_file)
+        box.bind("<F3>", self.repeat_find)
         box.bind("<F5>", self.refresh_files)
         box.bind("<Left>", self.open_parent)
         box.bind("<Motion>", self.highlight_current_line)
@@ -112,26 +287,177 @@ class App(tk.Tk):
         box.bind("<Right>", self.open_file)
         box.bind("`", self.duplicate_tab)
         box.bind("e", self.edit_file)
+        box.bind("g", self.grep_files)
         box.bind("l", self.create_links)
         box.bind("n", self.create_file)
         box.bind("o", self.create_folder)
+        box.bind("p", self.toggle_preview)
+        box.bind("<<ListboxSelect>>", self.preview_file)
         box.bind("q", self.close_tab)
         box.bind("Q", self.quit_app)
+        box.bind("S", self.cycle_sort)
+        box.bind("R", self.reverse_sort)
+        box.bind("D", self.toggle_dirs_first)
+        box.bind("U", self.toggle_usage)
         box.bind("s", self.open_terminal)
         box.bind("x", self.fuzzy_open_local)
         box.bind("X", self.fuzzy_open_global)
         box.bind("z", self.fuzzy_edit_local)
         box.bind("Z", self.fuzzy_edit_global)
         box.bind("h", self.show_help)
-        self.load_files(box, path)
-        return tab
+        snapshot = data.pop("snapshot", {})
+        try:
+            self.load_files(box, data["dir"], selection=snapshot.get("active"))
+        except OSError as e:
+            print(f"Cannot list {data['dir']}: {e}")
+        if snapshot.get("selection"):
+            self.restore_selection(tab, snapshot["selection"], snapshot.get("top", 0))
+        return box
+
+    def restore_selection(self, tab, names, top):
+        box, model = self.data[tab]["box"], self.data[tab]["model"]
+        box.selection_clear(0, tk.END)
+        for name in names:
+            index = model.index(name) if model else None
+            if index is not None:
+                box.selection_set(index)
+        box.yview(top)
+
+    def set_dir(self, tab, dir):
+        old = self.data[tab]["dir"]
+        if old != dir:
+            self.cancel_usage(tab)
+            self.data[tab]["totals"] = {}
+            self.close_filter(tab)
+        if old in self.tabs_by_dir:
+            self.tabs_by_dir[old].pop(tab, None)
+            if not self.tabs_by_dir[old]:
+                del self.tabs_by_dir[old]
+        self.data[tab]["dir"] = dir
+        if dir is not None:
+            self.tabs_by_dir.setdefault(dir, {})[tab] = None
+
+    def forget_tab(self, tab):
+        if tab not in self.data:
+            self.grep.cancel()
+            self.results.destroy()
+            self.results = None
+            return
+        self.set_dir(tab, None)
+        self.recent.pop(tab, None)
+        self.data.pop(tab)
+
+    def live_dirs(self):
+        return {data["dir"] for data in list(self.data.values()) if data["box"]}
+
+    def snapshot(self, tab):
+        data = self.data[tab]
+        box = data["box"]
+        if not box:
+            return dict(data.get("snapshot") or {"dir": data["dir"]})
+        return {
+            "dir": data["dir"],
+            "active": box.get(tk.ACTIVE) if box.size() else None,
+            "selection": [box.get(i) for i in box.curselection()],
+            "top": box.top,
+            "sort": data["sort"],
+        }
+
+    def hibernate(self, tab):
+        data = self.data[tab]
+        if not data["box"]:
+            return
+        self.cancel_usage(tab)
+        self.close_filter(tab)
+        data["snapshot"] = self.snapshot(tab)
+        data["box"].destroy()
+        if data["bar"]:
+            data["bar"].destroy()
+        data.update(box=None, bar=None, model=None, entries=[], colors=[], totals={})
+
+    def hibernate_tabs(self):
+        live = [
+            (tab, len(self.data[tab]["entries"]))
+            for tab in self.recent if self.data[tab]["box"]
+        ]
+        current = self.tab.select()
+        for tab in session.hibernating(
+            live, current, config.app.live_tabs, config.app.live_rows
+        ):
+            self.hibernate(tab)
+
+    def get_box(self, tab):
+        return self.data[tab]["box"] or self.build_tab(tab)
+
+    def restore_tabs(self, snapshots, current=0):
+        tabs = []
+        for snapshot in snapshots:
+            tab = self.new_tab(snapshot["dir"], lazy=True)
+            self.data[tab]["snapshot"] = snapshot
+            order = self.data[tab]["sort"]
+            saved = snapshot.get("sort") or {}
+            if saved.get("mode") in SORTS:
+                order.update((key, saved.get(key, order[key])) for key in order)
+            tabs.append(tab)
+        if not tabs:
+            return
+        current = tabs[min(current, len(tabs) - 1)]
+        self.tab.select(current)
+        dirs = [self.data[current]["dir"]] + [self.data[tab]["dir"] for tab in tabs]
+        dirs = list(dict.fromkeys(dirs))
+        entries = self.session.listing(dirs[0])
+        if entries is not None:
+            self.cache.seed(dirs[0], entries)
+        threading.Thread(target=self.prewarm, args=(dirs,), daemon=True).start()
+
+    def prewarm(self, dirs):
+        seeded = set()
+        for dir in dirs:
+            entries = self.cache.peek(dir) or self.session.listing(dir)
+            if entries is not None:
+                self.cache.seed(dir, entries)
+                seeded.add(dir)
+        for dir in dirs:
+            try:
+                if dir in seeded:
+                    self.cache.revalidate(dir)
+                elif config.app.prewarm:
+                    self.cache.get(dir)
+            except OSError:
+                pass
+
+    def session_state(self):
+        tabs = []
+        current = 0
+        listings = {}
+        for tab in self.tab.tabs():
+            if tab not in self.data:
+                continue
+            if tab == self.tab.select():
+                current = len(tabs)
+            snapshot = self.snapshot(tab)
+            listings[snapshot["dir"]] = self.cache.peek(snapshot["dir"])
+            tabs.append(snapshot)
+        return tabs, current, listings
+
+    def save_session(self):
+        tabs, current, listings = self.session_state()
+        signature = current, [
+            (tab["dir"], tab.get("active"), tab.get("selection"), tab.get("top"))
+            + (dict(tab.get("sort") or {}), id(listings[tab["dir"]]))
+            for tab in tabs
+        ]
+        if signature != self.signature:
+            self.signature = signature
+            self.session.save(tabs, current, listings)
+        self.after(config.session.interval, self.save_session)
 
     def duplicate_tab(self, event=None):
         source = self.tab.select()
-        if source:
+        if source in self.data:
             target = self.new_tab(self.data[source]["dir"])
-            source = self.data[source]["box"]
-            target = self.data[target]["box"]
+            source = self.get_box(source)
+            target = self.get_box(target)
             target.selection_clear(0, "end")
             focused = source.index(tk.ACTIVE)
             target.selection_set(focused)
@@ -142,8 +468,11 @@ class App(tk.Tk):
     def tab_activated(self):
         try:
             tab = self.tab.select()
-            box = self.data[tab]["box"]
-            dir = self.data[tab]["dir"]
+            if tab not in self.data:
+                self.results.box.focus_set()
+                return
+            box = self.get_box(tab)
+            self.recent.move_to_end(tab)
             if box.size() == 0:
                 return
             focused = box.index(tk.ACTIVE)
@@ -151,6 +480,7 @@ class App(tk.Tk):
             if not selection:
                 box.selection_set(focused)
             box.focus_set()
+            self.preview_file()
         except:
             pass
 
@@ -161,33 +491,30 @@ class App(tk.Tk):
             self.tab.close()
 
     def get_tabs(self):
-        return [self.data[tab]["dir"] for tab in self.tab.tabs()]
+        return [self.data[tab]["dir"] for tab in self.tab.tabs() if tab in self.data]
 
     def quit_app(self, event=None):
-        save_state(self.get_tabs())
+        self.session.save(*self.session_state())
+        self.session.flush()
         quit()
 
     def create_console(self):
         if hasattr(self, "console"):
             return
         console = self.console = Console(self, prompt="> ")
+        console.locals.update(app=self, stats=self.stats)
         console.frame.pack(fill=tk.X)
         frame = ttk.Frame(self)
         sys.stdin, sys.stdout, sys.stderr = console, console, console
 
     def box_context(self):
         tab = self.tab.select()
-        box = self.data[tab]["box"]
+        box = self.get_box(tab)
         dir = self.data[tab]["dir"]
         selection = box.curselection()
         if not selection:
             return tab, box, dir, None
-        items = [box.get(i) for i in selection]
-        paths = [
-            os.path.join(dir, item) if item != ".." else os.path.dirname(dir)
-            for item in items
-        ]
-        return tab, box, dir, paths
+        return tab, box, dir, self.data[tab]["model"].paths(selection)
 
     def highlight_current_line(self, event):
         return
@@ -210,7 +537,7 @@ class App(tk.Tk):
         print(f"Copied {', '.join(names)} from {dir}")
 
     def change_folder(self, tab, box, path):
-        self.data[tab]["dir"] = path
+        self.set_dir(tab, path)
         self.load_files(box, path)
         self.tab.tab(tab, text=os.path.basename(path) or path)
 
@@ -219,27 +546,28 @@ class App(tk.Tk):
         name = simpledialog.askstring("New File", "File name:")
         if name:
             Path.touch(os.path.join(dir, name))
-            self.load_files(box, dir)
+            self.reload_files(box, dir, focus=name)
 
     def create_folder(self, event=None):
         tab, box, dir, paths = self.box_context()
         name = simpledialog.askstring("New Folder", "Folder name:")
         if name:
             os.mkdir(os.path.join(dir, name))
-            self.load_files(box, dir)
+            self.reload_files(box, dir, focus=name)
 
     def create_links(self, event=None):
         tab, box, dir, paths = self.box_context()
         if not hasattr(self, "copied_files"):
             return
-        for file in self.copied_files:
-            link = os.path.relpath(file, dir)
-            os.symlink(link, os.path.join(dir, os.path.basename(link)))
-            print(f"Linked as {link} to {dir}")
-        self.load_files(box, dir)
+        items = [
+            (path, os.path.join(dir, os.path.basename(path)))
+            for path in self.copied_files
+        ]
+        self.jobs.submit(Job("link", items))
 
     def cut_files(self, event=None):
         tab, box, dir, paths = self.box_context()
+        paths = self.data[tab]["model"].sources(box.curselection())
         self.paste_mode = "cut"
         self.copied_files = paths
         if not paths:
@@ -249,19 +577,14 @@ class App(tk.Tk):
 
     def delete_files(self, event=None):
         tab, box, dir, paths = self.box_context()
+        paths = self.data[tab]["model"].sources(box.curselection())
+        paths = [path for path in paths if path != os.path.dirname(dir)]
         if not paths:
             return
         names = [os.path.basename(path) for path in paths]
         print(f"Files to be deleted {', '.join(names)} from {dir}")
         if messagebox.askyesno("Confirm", "Are you sure?"):
-            for path in paths:
-                if os.path.islink(path):
-                    os.remove(path)
-                elif os.path.isfile(path):
-                    os.remove(path)
-                elif os.path.isdir(path):
-                    os.rmdir(path)
-            self.load_files(box, dir)
+            self.jobs.submit(Job("delete", [(path, None) for path in paths]))
 
     def edit_file(self, event=None):
         tab, box, dir, paths = self.box_context()
@@ -271,26 +594,159 @@ class App(tk.Tk):
         if os.path.isdir(path):
             self.change_folder(tab, box, path)
         else:
-            subprocess.run(["edit", path], cwd=os.path.dirname(path))
+            self.edit_path(path)
+
+    def edit_path(self, path, line=None):
+        args = ["edit", f"+{line}", path] if line else ["edit", path]
+        subprocess.run(args, cwd=os.path.dirname(path))
 
     def filter_files(self, event=None):
         tab, box, dir, paths = self.box_context()
-        pattern = simpledialog.askstring("Filter", "Pattern:")
-        self.load_files(box, dir, pattern=pattern)
+        data = self.data[tab]
+        if not data["bar"]:
+            bar = data["bar"] = ttk.Entry(data["frame"])
+            bar.bind("<KeyRelease>", lambda event: self.filter_changed(tab, event))
+            bar.bind("<Return>", lambda event: box.focus_set())
+            bar.bind("<Down>", lambda event: box.focus_set())
+            bar.bind("<Escape>", lambda event: self.clear_filter(tab))
+        if not data["bar"].winfo_ismapped():
+            data["bar"].pack(fill=tk.X, padx=4, pady=(4, 0), before=box)
+        data["bar"].focus_set()
+
+    def filter_changed(self, tab, event=None):
+        if event and event.keysym in ("Return", "Down", "Escape"):
+            return
+        data = self.data[tab]
+        query = data["bar"].get()
+        if query == data["query"]:
+            return
+        if data["filtering"]:
+            self.after_cancel(data["filtering"])
+            data["filtering"] = None
+        data["query"] = query
+        self.step_filter(tab)
+
+    def step_filter(self, tab):
+        data = self.data[tab]
+        indices = self.narrow(tab, config.explorer.filter_budget)
+        if indices is None:
+            data["filtering"] = self.after(1, self.step_filter, tab)
+            return
+        data["filtering"] = None
+        self.display(tab, data["dir"], indices, focus=False)
+
+    def clear_filter(self, tab):
+        box = self.data[tab]["box"]
+        active = box.get(tk.ACTIVE) if box.size() else None
+        self.close_filter(tab)
+        self.display(tab, self.data[tab]["dir"], self.narrow(tab), active)
+
+    def close_filter(self, tab):
+        data = self.data[tab]
+        if data["filtering"]:
+            self.after_cancel(data["filtering"])
+        data["query"] = data["matcher"] = data["filtering"] = None
+        if data["bar"]:
+            data["bar"].delete(0, tk.END)
+            data["bar"].pack_forget()
+
+    def toggle_preview(self, event=None):
+        if self.preview:
+            self.preview.destroy()
+            self.after_cancel(self.polling)
+            self.preview = self.wanted = self.polling = None
+            return
+        self.preview = tk.Text(
+            self, width=config.preview.width, wrap=tk.NONE, bd=0, highlightthickness=0
+        )
+        self.preview.pack(
+            side=tk.RIGHT, fill=tk.Y, padx=(0, 4), pady=4, before=self.tab
+        )
+        self.polling = self.after(config.preview.interval, self.poll_previews)
+        self.preview_file()
+
+    def preview_file(self, event=None):
+        tab = self.tab.select()
+        if not self.preview or tab not in self.data:
+            return
+        box, model = self.data[tab]["box"], self.data[tab]["model"]
+        if not box or not model or not box.size():
+            return self.show_preview("")
+        index = box.index(tk.ACTIVE)
+        indices = [index]
+        for distance in range(1, config.preview.prefetch + 1):
+            indices += [index + distance, index - distance]
+        indices = [i for i in indices if 0 <= i < len(model)]
+        keys = [preview_key(model, i) for i in indices]
+        self.wanted = keys[0]
+        text = self.previews.get(self.wanted)
+        if text is not None:
+            self.show_preview(text)
+        self.previews.request(keys)
+
+    def show_preview(self, text):
+        self.preview.config(state=tk.NORMAL)
+        self.preview.delete("1.0", tk.END)
+        self.preview.insert("1.0", text)
+        self.preview.config(state=tk.DISABLED)
+
+    def poll_previews(self):
+        while not self.previews.results.empty():
+            key = self.previews.results.get()
+            if self.preview and key == self.wanted:
+                self.show_preview(self.previews.get(key) or "")
+        self.polling = self.after(config.preview.interval, self.poll_previews)
 
     def fuzzy_open_local(self, event=None):
         tab, box, dir, paths = self.box_context()
-        subprocess.run(["spawn", "st", "fuzzyopen", "."], cwd=dir)
+        self.pick_file(dir, "Open", self.open_picked)
 
     def fuzzy_open_global(self, event=None):
-        subprocess.run(["spawn", "st", "fuzzyopen", "."], cwd=os.path.expanduser("~"))
+        self.pick_file(os.path.expanduser("~"), "Open", self.open_picked)
 
     def fuzzy_edit_local(self, event=None):
         tab, box, dir, paths = self.box_context()
-        subprocess.run(["spawn", "st", "fuzzyedit", "."], cwd=dir)
+        self.pick_file(dir, "Edit", self.edit_picked)
 
     def fuzzy_edit_global(self, event=None):
-        subprocess.run(["spawn", "st", "fuzzyedit", "."], cwd=os.path.expanduser("~"))
+        self.pick_file(os.path.expanduser("~"), "Edit", self.edit_picked)
+
+    def pick_file(self, root, title, callback):
+        if root not in self.indexes:
+            self.indexes[root] = Index(root, ignore=config.index.ignore)
+        index = self.indexes[root]
+        index.start()
+        Picker(self, index, callback, f"{title} {root}")
+
+    def open_picked(self, path):
+        if os.path.isdir(path):
+            self.new_tab(path)
+            return
+        tab = self.new_tab(os.path.dirname(path))
+        self.select_file(tab, os.path.basename(path))
+
+    def edit_picked(self, path):
+        if os.path.isdir(path):
+            self.new_tab(path)
+            return
+        self.edit_path(path)
+
+    def grep_files(self, event=None):
+        tab, box, dir, paths = self.box_context()
+        query = simpledialog.askstring("Grep", f"Search in {dir}:")
+        if not query:
+            return
+        try:
+            search = self.grep.start(dir, query)
+        except re.error as e:
+            print(f"Invalid pattern {query}: {e}")
+            return
+        if not self.results:
+            self.results = Results(self.tab, self.edit_path, config.grep.interval)
+            self.tab.add(self.results, text="Grep")
+        self.tab.tab(self.results, text=f"Grep {query}")
+        self.results.start(search, query)
+        self.tab.select(self.results)
 
     def make_executable(self, event=None):
         tab, box, dir, paths = self.box_context()
@@ -298,6 +754,7 @@ class App(tk.Tk):
             return
         path = paths[0]
         os.chmod(path, 0o755)
+        self.cache.invalidate(dir)
         focused = box.index(tk.ACTIVE)
         box.itemconfig(focused, {"fg": config.explorer.executable_fg})
 
@@ -316,8 +773,8 @@ class App(tk.Tk):
         parent = os.path.dirname(dir)
         name = os.path.basename(dir)
         if parent and parent != dir:
-            self.data[tab]["dir"] = parent
-            self.load_files(self.data[tab]["box"], parent, selection=name)
+            self.set_dir(tab, parent)
+            self.load_files(box, parent, selection=name)
             self.tab.tab(tab, text=os.path.basename(parent) or parent)
 
     def open_terminal(self, event=None):
@@ -337,6 +794,7 @@ class App(tk.Tk):
         tab, box, dir, paths = self.box_context()
         if not hasattr(self, "copied_files"):
             return
+        items = []
         for path in self.copied_files:
             name = os.path.basename(path)
             dest = os.path.join(dir, name)
@@ -347,15 +805,12 @@ class App(tk.Tk):
                 else:
                     print(f"Skipping {path}")
                     continue
-            if self.paste_mode == "copy":
-                print(path, dest)
-                shutil.copy(path, dest, follow_symlinks=False)
-            elif self.paste_mode == "cut":
-                shutil.move(path, dest)
-            print(f"Pasted {path} to {dir} as {name}")
+            items.append((path, dest))
+        if items:
+            kind = "copy" if self.paste_mode == "copy" else "move"
+            self.jobs.submit(Job(kind, items))
         if self.paste_mode == "cut":
             self.copied_files = []
-        self.load_files(box, dir)
 
     def rename_file(self, event=None):
         tab, box, dir, paths = self.box_context()
@@ -366,31 +821,132 @@ class App(tk.Tk):
         name = simpledialog.askstring("Rename", f"Rename {path} to:", initialvalue=name)
         if name:
             os.rename(path, os.path.join(dir, name))
-            self.load_files(box, dir)
+            self.reload_files(box, dir, focus=name)
 
     def refresh_files(self, event=None):
         tab, box, dir, paths = self.box_context()
         if tab:
-            self.load_files(box, dir)
+            self.reload_files(box, dir)
 
     def search_file(self, event=None):
+        query = simpledialog.askstring("Search", "Pattern:", initialvalue=self.query)
+        if query:
+            self.query = query
+            self.repeat_find()
+
+    def repeat_find(self, event=None):
         tab, box, dir, paths = self.box_context()
-        pattern = simpledialog.askstring("Search", "Pattern:")
-        if not pattern:
+        model = self.data[tab]["model"]
+        if not self.query or not model:
             return
-        focused = box.index(tk.ACTIVE)
-        if focused is None:
-            focused = -1
-        start = (focused + 1) % box.size()
-        for i in range(box.size()):
-            index = (start + i) % box.size()
-            text = box.get(index).lower()
-            if pattern.lower() in text:
-                box.selection_clear(0, tk.END)
-                box.selection_set(index)
-                box.activate(index)
-                box.see(index)
-                return
+        try:
+            index = model.find(self.query, box.index(tk.ACTIVE) + 1)
+        except re.error as e:
+            print(f"Invalid pattern {self.query}: {e}")
+            return
+        if index is not None:
+            self.focus_index(box, index)
+
+    def focus_index(self, box, index):
+        box.selection_clear(0, tk.END)
+        box.selection_set(index)
+        box.activate(index)
+        box.see(index)
+
+    def resort(self, **changes):
+        tab, box, dir, paths = self.box_context()
+        model = self.data[tab]["model"]
+        self.data[tab]["sort"].update(changes)
+        if model:
+            selection = box.get(tk.ACTIVE) if box.size() else None
+            entries = self.data[tab]["entries"]
+            self.show_files(box, model.dir, entries, selection, rescan=False)
+
+    def cycle_sort(self, event=None):
+        modes = list(SORTS)
+        mode = self.data[self.tab.select()]["sort"]["mode"]
+        mode = modes[(modes.index(mode) + 1) % len(modes)]
+        print(f"Sort by {mode}")
+        self.resort(mode=mode)
+
+    def reverse_sort(self, event=None):
+        self.resort(reverse=not self.data[self.tab.select()]["sort"]["reverse"])
+
+    def toggle_dirs_first(self, event=None):
+        self.resort(dirs_first=not self.data[self.tab.select()]["sort"]["dirs_first"])
+
+    def toggle_usage(self, event=None):
+        tab = self.tab.select()
+        data = self.data[tab]
+        data["usage"] = not data["usage"]
+        if data["usage"]:
+            self.scan_usage(tab)
+        else:
+            self.cancel_usage(tab)
+            data["totals"] = {}
+        self.show_usage(tab)
+
+    def scan_usage(self, tab):
+        data = self.data[tab]
+        model = data["model"]
+        self.cancel_usage(tab)
+        if not model:
+            return
+        names = [entry.name for entry in model.entries if entry.dir and not entry.link]
+        try:
+            data["scan"] = self.usage.scan(model.dir, names)
+        except OSError as e:
+            print(f"Cannot measure {model.dir}: {e}")
+
+    def cancel_usage(self, tab):
+        scan = self.data[tab]["scan"]
+        if scan:
+            scan.cancel()
+            self.data[tab]["scan"] = None
+
+    def show_usage(self, tab):
+        data = self.data[tab]
+        box, model = data["box"], data["model"]
+        if not box or not model:
+            return
+        labels = {}
+        for name, (size, files) in data["totals"].items():
+            index = model.index(name)
+            if index is not None:
+                labels[index] = f"{name}  ({format_size(size)}, {files} files)"
+        box.relabel(labels)
+
+    def poll_usage(self):
+        for tab, data in list(self.data.items()):
+            scan = data["scan"]
+            if not scan or scan.results.empty():
+                continue
+            finished = False
+            while not scan.results.empty():
+                result = scan.results.get()
+                if result is None:
+                    finished = True
+                else:
+                    name, size, files = result
+                    data["totals"][name] = size, files
+            if finished:
+                data["scan"] = None
+                self.usage_finished(tab)
+            else:
+                self.show_usage(tab)
+        self.after(config.usage.interval, self.poll_usage)
+
+    def usage_finished(self, tab):
+        data = self.data[tab]
+        box, model, totals = data["box"], data["model"], data["totals"]
+        entries = [
+            entry._replace(size=totals[entry.name][0])
+            if entry.name in totals
+            else entry
+            for entry in data["entries"]
+        ]
+        selection = box.get(tk.ACTIVE) if box.size() else None
+        self.show_files(box, model.dir, entries, selection, focus=False, rescan=False)
 
     def toggle_fullscreen(self, event=None):
         self.attributes("-fullscreen", not self.attributes("-fullscreen"))
@@ -400,15 +956,14 @@ class App(tk.Tk):
         self.show_hidden = not self.show_hidden
         self.load_files(box, dir)
 
-    def select_file(self, box, name):
-        for i in range(box.size()):
-            if box.get(i) == name:
-                box.selection_clear(0, tk.END)
-                box.selection_set(i)
-                box.activate(i)
-                box.see(i)
-                return True
-        return False
+    def select_file(self, tab, name):
+        box = self.get_box(tab)
+        model = self.data[tab]["model"]
+        index = model.index(name) if model else None
+        if index is None:
+            return False
+        self.focus_index(box, index)
+        return True
 
     def show_help(self, event=None):
         help_text = "\n".join(f"{key:12} {desc}" for key, desc, _ in self.bindings)
@@ -426,11 +981,7 @@ class App(tk.Tk):
             nearest = box.nearest(event.y)
             box.select_set(nearest)
             box.activate(nearest)
-            name = box.get(nearest)
-            if name == "..":
-                path = os.path.dirname(dir)
-            else:
-                path = os.path.join(dir, box.get(nearest))
+            path = self.data[tab]["model"].path(nearest)
         else:
             path = dir
         if press_duration >= 175:
@@ -462,50 +1013,85 @@ class App(tk.Tk):
         self.menu.add_separator()
         self.menu.add_command(label="Open Terminal", command=self.open_terminal)
         self.menu.add_command(label="Toggle Hidden", command=self.toggle_hidden)
+        self.menu.add_cascade(label="Sort", menu=self.sort_menu)
+        self.menu.add_command(label="Disk Usage", command=self.toggle_usage)
         self.menu.post(event.x_root, event.y_root)
 
     def hide_menu(self, event):
         self.menu.unpost()
 
 
+def color(entry):
+    return getattr(config.explorer, f"{entry.type}_fg")
+
+
+def preview_key(model, index):
+    entry = model.entries[index - 1] if index else None
+    return model.path(index), entry and entry.mtime, entry and entry.size
+
+
 def open_path(app, path):
     path = os.path.abspath(path)
     if not os.path.exists(path):
-        return
-    for tab_id, data in app.data.items():
-        if data["dir"] == path:
-            app.tab.select(tab_id)
-            app.lift()
-            app.focus_force()
-            return
+        return False
+    for tab in app.tabs_by_dir.get(path, ()):
+        app.tab.select(tab)
+        app.lift()
+        app.focus_force()
+        return True
     if os.path.isdir(path):
         app.new_tab(path)
     else:
         subprocess.run(["open", path], cwd=os.path.dirname(path))
     app.lift()
     app.focus_force()
+    return True
 
 
-if __name__ == "__main__":
-    path = sys.argv[1] if len(sys.argv) > 1 else None
-    if path:
-        path = os.path.abspath(os.path.expanduser(path))
+def handle_request(app, command, args):
+    if command in ("open", "batch-open"):
+        missing = [path for path in args if not open_path(app, path)]
+        if missing:
+            raise ProtocolError(f"No such path {', '.join(missing)}")
+    elif command == "list-tabs":
+        return app.get_tabs()
+    elif command == "select":
+        path = os.path.abspath(args[0])
+        if not open_path(app, os.path.dirname(path)):
+            raise ProtocolError(f"No such path {path}")
+        if not app.select_file(app.tab.select(), os.path.basename(path)):
+            raise ProtocolError(f"No such file {path}")
+    else:
+        raise ProtocolError(f"Unknown command {command}")
 
-    if server.is_running():
-        if path:
-            server.send(path)
-        else:
-            print("already running")
-        sys.exit(0)
+
+def serve(app):
+    def handler(command, args):
+        return handle_request(app, command, args)
+
+    def wake(drain):
+        app.after(0, drain)
+
+    return server.start(handler, wake=wake)
+
+
+if __name__ == "__main__":
+    paths = [os.path.abspath(os.path.expanduser(arg)) for arg in sys.argv[1:]]
+    try:
+        if client.forward(paths):
+            if not paths:
+                print("already running")
+            sys.exit(0)
+    except ProtocolError as e:
+        sys.exit(f"pi: {e}")
 
     a = App()
-    saved_tabs = [p for p in load_state() if os.path.isdir(p)]
-    if saved_tabs:
-        a.tab.forget(0)
-        a.data.clear()
-        for tab_path in saved_tabs:
-            a.new_tab(tab_path)
-    server.start(lambda p: a.after(0, lambda: open_path(a, p)))
+    a.restore_tabs(*session.load())
+    for path in paths:
+        open_path(a, path)
+    if not a.tab.tabs():
+        a.new_tab(os.getcwd())
+    serve(a)
 
     style = ttk.Style()
     style.configure(".", font=config.app.font)
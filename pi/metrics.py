@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+from collections import deque
+
+MISSING = object()
+
+
+class Sampler:
+    def __init__(self, sources, intervals, history=60):
+        self.sources = sources
+        self.intervals = intervals
+        self.history = {name: deque(maxlen=history) for name in sources}
+        self.latest = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        due = dict.fromkeys(self.sources, 0)
+        while not self.stopped.is_set():
+            now = time.monotonic()
+            for name, at in due.items():
+                if at <= now:
+                    self.sample(name)
+                    due[name] = now + self.intervals.get(name, 1)
+            self.stopped.wait(max(0, min(due.values()) - time.monotonic()))
+
+    def sample(self, name):
+        try:
+            value = self.sources[name]()
+        except Exception:
+            value = None
+        with self.lock:
+            self.history[name].append((time.time(), value))
+            if self.latest.get(name, MISSING) != value:
+                self.latest[name] = value
+                self.pending[name] = value
+
+    def changed(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        return pending
+
+    def series(self, name):
+        with self.lock:
+            return list(self.history[name])
+
+
+class Rate:
+    def __init__(self, counter):
+        self.counter = counter
+        self.last = None
+
+    def __call__(self):
+        now = time.monotonic()
+        values = self.counter()
+        last, self.last = self.last, (now, values)
+        if not last:
+            return None
+        elapsed = now - last[0]
+        return tuple(
+            round((new - old) / elapsed / 1024) * 1024
+            for new, old in zip(values, last[1])
+        )
+
+
+def sources():
+    import psutil
+
+    def battery():
+        battery = psutil.sensors_battery()
+        return battery and (int(battery.percent), battery.power_plugged)
+
+    def disk():
+        counters = psutil.disk_io_counters()
+        return counters.read_bytes, counters.write_bytes
+
+    return {
+        "clock": lambda: time.strftime("%H:%M:%S"),
+        "battery": battery,
+        "cpu": lambda: round(psutil.cpu_percent()),
+        "memory": lambda: round(psutil.virtual_memory().percent),
+        "load": lambda: tuple(round(load, 2) for load in os.getloadavg()),
+        "io": Rate(disk),
+    }
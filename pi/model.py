@@ -0,0 +1,216 @@
+import bisect
+import fnmatch
+import os
+import re
+import time
+
+from functools import cached_property
+from itertools import accumulate, compress
+
+from pi.text import fold
+
+CHUNK = 2048
+RANK = 2000
+
+
+class Listing:
+    def __init__(self, dir, entries=()):
+        self.dir = dir
+        self.entries = list(entries)
+        self.names = [".."] + [entry.name for entry in self.entries]
+
+    @cached_property
+    def positions(self):
+        return {name: index for index, name in enumerate(self.names)}
+
+    @cached_property
+    def text(self):
+        return "\n".join(self.names)
+
+    @cached_property
+    def folded(self):
+        return fold(self.text)
+
+    @cached_property
+    def offsets(self):
+        return list(accumulate((len(name) + 1 for name in self.names[:-1]), initial=0))
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name):
+        return self.positions.get(name)
+
+    def path(self, index):
+        name = self.names[index]
+        if name == "..":
+            return os.path.dirname(self.dir)
+        return os.path.join(self.dir, name)
+
+    def paths(self, indices):
+        return [self.path(index) for index in indices]
+
+    def sources(self, indices):
+        return [self.path(index) for index in indices if index]
+
+    def find(self, query, start=0):
+        pattern, folded = compile_query(query)
+        text = self.folded if folded else self.text
+        offset = self.offsets[start % len(self.offsets)]
+        match = pattern.search(text, offset) or pattern.search(text, 0, offset)
+        if not match:
+            return None
+        return bisect.bisect_right(self.offsets, match.start()) - 1
+
+
+class Filter:
+    def __init__(self, entries):
+        self.entries = entries
+        self.names = [entry.name.lower() for entry in entries]
+        self.results = {"": range(len(entries))}
+        self.pending = None
+
+    def source(self, query, fuzzy):
+        if not fuzzy:
+            return self.results[""]
+        known = [known for known in self.results if query.startswith(known)]
+        return self.results[max(known, key=len)]
+
+    def match(self, query, budget=None):
+        if not query.startswith("/"):
+            query = query.lower()
+        if query in self.results:
+            return self.results[query]
+        if not self.pending or self.pending[0] != query:
+            test, fuzzy = compile_filter(query)
+            self.pending = [query, test, fuzzy, self.source(query, fuzzy), 0, []]
+        query, test, fuzzy, indices, position, found = self.pending
+        deadline = time.perf_counter() + budget if budget else None
+        names = self.names
+        while position < len(indices):
+            chunk = indices[position:position + CHUNK]
+            if isinstance(chunk, range):
+                found.extend(compress(chunk, map(test, names[chunk.start:chunk.stop])))
+            else:
+                found.extend(index for index in chunk if test(names[index]))
+            position += len(chunk)
+            if deadline and position < len(indices) and time.perf_counter() > deadline:
+                self.pending[4] = position
+                return None
+        self.pending = None
+        if fuzzy and len(found) <= RANK:
+            found.sort(key=lambda index: rank(names[index], query))
+        self.results[query] = found
+        return found
+
+
+def rank(name, query):
+    return not name.startswith(query), query not in name, len(name)
+
+
+def compile_filter(query):
+    if query.startswith("/"):
+        query = query[1:-1] if len(query) > 1 and query.endswith("/") else query[1:]
+        return re.compile(query, re.IGNORECASE).search, False
+    if any(c in query for c in "*?["):
+        return re.compile(fnmatch.translate(query)).match, False
+    pattern = re.escape(query[0]) + "".join(
+        f"[^{re.escape(c)}]*{re.escape(c)}" for c in query[1:]
+    )
+    return re.compile(pattern).search, True
+
+
+def increasing(sequence):
+    if all(a < b for a, b in zip(sequence, sequence[1:])):
+        return set(sequence)
+    tails, links, ends = [], [], []
+    for index, value in enumerate(sequence):
+        position = bisect.bisect_left(tails, value)
+        if position == len(tails):
+            tails.append(value)
+            ends.append(index)
+        else:
+            tails[position] = value
+            ends[position] = index
+        links.append(ends[position - 1] if position else None)
+    kept = set()
+    index = ends[-1] if ends else None
+    while index is not None:
+        kept.add(sequence[index])
+        index = links[index]
+    return kept
+
+
+def spans(indices):
+    spans = []
+    for index in indices:
+        if spans and spans[-1][1] == index:
+            spans[-1][1] = index + 1
+        else:
+            spans.append([index, index + 1])
+    return [tuple(span) for span in spans]
+
+
+def common(old, new, suffix=False):
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if suffix:
+            same = old[len(old) - middle:] == new[len(new) - middle:]
+        else:
+            same = old[:middle] == new[:middle]
+        low, high = (middle, high) if same else (low, middle - 1)
+    return low
+
+
+def diff(old, new):
+    prefix = common(old, new)
+    suffix = common(old[prefix:], new[prefix:], suffix=True)
+    old, new = old[prefix:len(old) - suffix], new[prefix:len(new) - suffix]
+    positions = {entry.name: index for index, entry in enumerate(old)}
+    kept = increasing([positions[e.name] for e in new if e.name in positions])
+    deletes = spans(prefix + i for i in range(len(old)) if i not in kept)
+    inserts, updates = [], []
+    for index, entry in enumerate(new):
+        position = positions.get(entry.name)
+        if position not in kept:
+            inserts.append(prefix + index)
+        elif old[position] != entry:
+            updates.append(prefix + index)
+    return deletes, spans(inserts), updates
+
+
+def natural(name):
+    parts = NUMBERS.split(name.lower())
+    return [int(part) if part.isdigit() else part for part in parts]
+
+
+def extension(entry):
+    return os.path.splitext(entry.name)[1].lower()
+
+
+NUMBERS = re.compile(r"(\d+)")
+SORTS = {
+    "name": lambda entry: entry.name,
+    "natural": lambda entry: natural(entry.name),
+    "mtime": lambda entry: entry.mtime,
+    "size": lambda entry: entry.size,
+    "extension": extension,
+}
+DESCENDING = {"mtime", "size"}
+
+
+def sort(entries, mode="name", reverse=False, dirs_first=False):
+    entries = sorted(entries, key=lambda entry: entry.name)
+    entries.sort(key=SORTS[mode], reverse=reverse != (mode in DESCENDING))
+    if dirs_first:
+        entries.sort(key=lambda entry: not entry.dir)
+    return entries
+
+
+def compile_query(query):
+    if len(query) > 1 and query.startswith("/") and query.endswith("/"):
+        return re.compile(query[1:-1], re.IGNORECASE | re.MULTILINE), False
+    if query.startswith("^"):
+        return re.compile("^" + re.escape(query[1:].lower()), re.MULTILINE), True
+    return re.compile(re.escape(query.lower())), True
@@ -0,0 +1,66 @@
+import tkinter as tk
+
+from pi.explorer import Explorer
+
+
+class Picker(tk.Toplevel):
+    def __init__(self, parent, index, callback, title="Open", interval=200):
+        super().__init__(parent)
+        self.title(title)
+        self.transient(parent)
+        self.geometry("800x500")
+        self.index = index
+        self.callback = callback
+        self.interval = interval
+        self.version = None
+        self.pending = None
+        self.results = []
+        self.entry = tk.Entry(self)
+        self.entry.pack(fill=tk.X, padx=4, pady=4)
+        self.box = Explorer(self, activestyle="none")
+        self.box.pack(fill=tk.BOTH, expand=True, padx=4, pady=(0, 4))
+        self.entry.bind("<KeyRelease>", self.schedule)
+        self.entry.bind("<Return>", self.choose)
+        self.entry.bind("<Escape>", lambda event: self.destroy())
+        self.entry.bind("<Up>", lambda event: self.box.move(-1))
+        self.entry.bind("<Down>", lambda event: self.box.move(1))
+        self.entry.bind("<Prior>", lambda event: self.box.move(-self.box.rows()))
+        self.entry.bind("<Next>", lambda event: self.box.move(self.box.rows()))
+        self.box.bind("<Double-1>", self.choose)
+        self.box.bind("<Return>", self.choose)
+        self.entry.focus_set()
+        self.poll()
+
+    def schedule(self, event=None):
+        if event and event.keysym in ("Up", "Down", "Prior", "Next", "Return"):
+            return
+        if self.pending:
+            self.after_cancel(self.pending)
+        self.pending = self.after(20, self.refresh)
+
+    def poll(self):
+        if self.index.version != self.version:
+            self.refresh()
+        self.polling = self.after(self.interval, self.poll)
+
+    def refresh(self):
+        self.pending = None
+        self.version = self.index.version
+        self.results = self.index.search(self.entry.get())
+        self.box.set_items(self.results)
+        if self.results:
+            self.box.selection_set(0)
+            self.box.activate(0)
+
+    def destroy(self):
+        self.after_cancel(self.polling)
+        if self.pending:
+            self.after_cancel(self.pending)
+        super().destroy()
+
+    def choose(self, event=None):
+        if not self.results:
+            return
+        path = self.index.resolve(self.box.get(tk.ACTIVE))
+        self.destroy()
+        self.callback(path)
@@ -0,0 +1,222 @@
+import mmap
+import os
+import shutil
+import threading
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, islice
+from pathlib import Path
+
+CHUNK = 1 << 20
+
+
+class Lines:
+    def __init__(self, data):
+        self.data = data
+        self.lock = threading.Lock()
+        self.newlines = array("Q")
+        self.scanned = 0
+        self.thread = None
+
+    def done(self):
+        return self.scanned >= len(self.data)
+
+    def extend(self):
+        start = self.scanned
+        end = min(len(self.data), start + CHUNK)
+        lengths = map(len, self.data[start:end].split(b"\n")[:-1])
+        positions = accumulate(lengths, step, initial=start - 1)
+        self.newlines.extend(islice(positions, 1, None))
+        self.scanned = end
+
+    def index(self):
+        while not self.done():
+            with self.lock:
+                self.extend()
+
+    def start(self):
+        if not self.thread and not self.done():
+            self.thread = threading.Thread(target=self.index, daemon=True)
+            self.thread.start()
+
+    def find(self, start, end, k):
+        with self.lock:
+            while True:
+                i = bisect_left(self.newlines, start)
+                if i + k < len(self.newlines) and self.newlines[i + k] < end:
+                    return self.newlines[i + k], k
+                if self.scanned >= end:
+                    return None, bisect_left(self.newlines, end) - i
+                self.extend()
+
+    def count(self, start, end):
+        return self.find(start, end, end - start)[1]
+
+    def estimate(self):
+        with self.lock:
+            if not self.scanned:
+                return 1
+            return len(self.newlines) * len(self.data) // self.scanned + 1
+
+
+def step(total, length):
+    return total + length + 1
+
+
+class PieceTable:
+    def __init__(self, data=b""):
+        self.added = bytearray()
+        self.buffers = [data, self.added]
+        self.lines = [Lines(data), Lines(self.added)]
+        self.pieces = [(0, 0, len(data))] if len(data) else []
+        self.undos = []
+        self.redos = []
+        self.last = None
+        self.version = 0
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                data = b""
+        table = cls(data)
+        table.lines[0].start()
+        return table
+
+    def __len__(self):
+        return sum(length for _, _, length in self.pieces)
+
+    def chunks(self, start=0, end=None):
+        position = 0
+        for buffer, offset, length in self.pieces:
+            if end is not None and position >= end:
+                break
+            if position + length > start:
+                lo = max(start - position, 0)
+                hi = length if end is None else min(end - position, length)
+                yield self.buffers[buffer][offset + lo:offset + hi]
+            position += length
+
+    def read(self, start=0, end=None):
+        return b"".join(self.chunks(start, end))
+
+    def locate(self, position):
+        for i, (_, _, length) in enumerate(self.pieces):
+            if position < length:
+                return i, position
+            position -= length
+        return len(self.pieces), 0
+
+    def insert(self, position, data):
+        if not data:
+            return
+        start = len(self.added)
+        self.added += data
+        i, inner = self.locate(position)
+        previous = self.pieces[i - 1] if i and not inner else None
+        if previous and previous[0] == 1 and previous[1] + previous[2] == start:
+            i, old, new = i - 1, [previous], [(1, previous[1], previous[2] + len(data))]
+        elif inner:
+            buffer, offset, length = self.pieces[i]
+            old = [self.pieces[i]]
+            new = [(buffer, offset, inner), (1, start, len(data))]
+            new.append((buffer, offset + inner, length - inner))
+        else:
+            old, new = [], [(1, start, len(data))]
+        self.edit("insert", position, position + len(data), i, old, new)
+
+    def delete(self, start, end):
+        if start >= end:
+            return
+        i, lo = self.locate(start)
+        j, hi = self.locate(end)
+        old = self.pieces[i:j + 1 if hi else j]
+        new = []
+        if lo:
+            buffer, offset, _ = self.pieces[i]
+            new.append((buffer, offset, lo))
+        if hi:
+            buffer, offset, length = self.pieces[j]
+            new.append((buffer, offset + hi, length - hi))
+        self.edit("delete", start, end, i, old, new)
+
+    def edit(self, kind, start, end, i, old, new):
+        self.pieces[i:i + len(old)] = new
+        self.redos.clear()
+        self.version += 1
+        last = self.last
+        joined = last and last[0] == kind and (
+            start == last[2] if kind == "insert" else end == last[1] or start == last[1]
+        )
+        if not joined:
+            self.undos.append([])
+        self.undos[-1].append((i, old, new, start))
+        self.last = (kind, start, end if kind == "insert" else start)
+
+    def separator(self):
+        self.last = None
+
+    def undo(self):
+        if not self.undos:
+            return None
+        group = self.undos.pop()
+        for i, old, new, _ in reversed(group):
+            self.pieces[i:i + len(new)] = old
+        self.redos.append(group)
+        return self.restored(group)
+
+    def redo(self):
+        if not self.redos:
+            return None
+        group = self.redos.pop()
+        for i, old, new, _ in group:
+            self.pieces[i:i + len(old)] = new
+        self.undos.append(group)
+        return self.restored(group)
+
+    def restored(self, group):
+        self.last = None
+        self.version += 1
+        return min(start for *_, start in group)
+
+    def line_offset(self, line):
+        if not line:
+            return 0
+        remaining = line - 1
+        position = 0
+        for buffer, offset, length in self.pieces:
+            found, count = self.lines[buffer].find(offset, offset + length, remaining)
+            if found is not None:
+                return position + found - offset + 1
+            remaining -= count
+            position += length
+        return None
+
+    def line_of(self, position):
+        line = 0
+        for buffer, offset, length in self.pieces:
+            if position <= 0:
+                break
+            line += self.lines[buffer].count(offset, offset + min(length, position))
+            position -= length
+        return line
+
+    def line_count(self):
+        if not self.lines[0].done():
+            return max(self.lines[0].estimate(), 1)
+        return self.line_of(len(self)) + 1
+
+    def save(self, path):
+        path = Path(path)
+        temp = path.with_name(f".{path.name}.{os.getpid()}")
+        with open(temp, "wb") as file:
+            for chunk in self.chunks():
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        if path.exists():
+            shutil.copymode(path, temp)
+        os.replace(temp, path)
@@ -0,0 +1,105 @@
+import mmap
+import os
+import stat
+import threading
+
+from collections import OrderedDict
+from queue import SimpleQueue
+
+from pi.text import binary
+
+KINDS = {
+    stat.S_IFIFO: "FIFO", stat.S_IFSOCK: "Socket", stat.S_IFCHR: "Character device",
+    stat.S_IFBLK: "Block device",
+}
+
+
+def head(path, limit):
+    with open(path, "rb") as file:
+        size = min(os.fstat(file.fileno()).st_size, limit)
+        if not size:
+            return b""
+        with mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as data:
+            return data[:]
+
+
+def hexdump(data, width=16):
+    lines = []
+    for offset in range(0, len(data), width):
+        chunk = data[offset:offset + width]
+        text = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        lines.append(f"{offset:08x}  {chunk.hex(' '):<{width * 3}} {text}")
+    return "\n".join(lines)
+
+
+def summary(path, lines):
+    with os.scandir(path) as it:
+        entries = [(entry.name, entry.is_dir()) for entry in it]
+    dirs = sum(dir for _, dir in entries)
+    names = sorted(name + "/" if dir else name for name, dir in entries)
+    header = f"{len(entries)} entries: {dirs} folders, {len(entries) - dirs} files"
+    return "\n".join([header, ""] + names[:lines])
+
+
+def render(path, limit=65536, lines=200):
+    try:
+        info = os.stat(path)
+        if stat.S_ISDIR(info.st_mode):
+            return summary(path, lines)
+        if not stat.S_ISREG(info.st_mode):
+            return KINDS.get(stat.S_IFMT(info.st_mode), "Special file")
+        data = head(path, limit)
+    except (OSError, ValueError) as e:
+        return str(e)
+    if binary(data):
+        return hexdump(data[:lines * 16])
+    return "\n".join(data.decode("utf-8", "replace").split("\n", lines)[:lines])
+
+
+class Previews:
+    def __init__(self, capacity=16 << 20, limit=65536, lines=200):
+        self.capacity = capacity
+        self.limit = limit
+        self.lines = lines
+        self.cache = OrderedDict()
+        self.size = 0
+        self.condition = threading.Condition()
+        self.pending = []
+        self.results = SimpleQueue()
+        self.thread = None
+
+    def get(self, key):
+        with self.condition:
+            text = self.cache.get(key)
+            if text is not None:
+                self.cache.move_to_end(key)
+            return text
+
+    def put(self, key, text):
+        with self.condition:
+            if key in self.cache:
+                self.size -= len(self.cache.pop(key))
+            self.cache[key] = text
+            self.size += len(text)
+            while self.size > self.capacity and len(self.cache) > 1:
+                self.size -= len(self.cache.popitem(last=False)[1])
+
+    def request(self, keys):
+        if not self.thread:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        with self.condition:
+            self.pending = [key for key in keys if key not in self.cache]
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                key = self.pending.pop(0)
+            try:
+                text = render(key[0], self.limit, self.lines)
+            except Exception as e:
+                text = f"Cannot preview: {e}"
+            self.put(key, text)
+            self.results.put(key)
@@ -0,0 +1,50 @@
+import tkinter as tk
+
+from tkinter import ttk
+
+from pi.utils import format_duration, format_size
+
+
+class Progress(ttk.Frame):
+    def __init__(self, parent, queue, callback, interval=200):
+        super().__init__(parent)
+        self.queue = queue
+        self.callback = callback
+        self.interval = interval
+        self.shown = False
+        self.bar = ttk.Progressbar(self, maximum=1.0, length=240)
+        self.bar.pack(side=tk.LEFT, padx=4, pady=4)
+        self.label = ttk.Label(self)
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
+        self.button = ttk.Button(self, text="Cancel", command=self.queue.cancel)
+        self.button.pack(side=tk.RIGHT, padx=4)
+        self.after(self.interval, self.refresh)
+
+    def refresh(self):
+        for job in self.queue.finished():
+            self.callback(job)
+        jobs = self.queue.active()
+        if jobs:
+            done = sum(job.bytes_done for job in jobs)
+            total = sum(job.bytes_total for job in jobs)
+            self.bar.config(value=done / total if total else jobs[0].fraction())
+            self.label.config(text=" | ".join(describe(job) for job in jobs))
+            if not self.shown:
+                self.pack(side=tk.BOTTOM, fill=tk.X)
+                self.shown = True
+        elif self.shown:
+            self.pack_forget()
+            self.shown = False
+        self.after(self.interval, self.refresh)
+
+
+def describe(job):
+    if job.status == "queued":
+        return f"{job}: queued"
+    text = f"{job}: {job.files_done}/{job.files_total} files"
+    if job.bytes_total:
+        done, total = format_size(job.bytes_done), format_size(job.bytes_total)
+        text += f", {done}/{total} at {format_size(job.throughput())}/s"
+    if (eta := job.eta()) is not None:
+        text += f", ETA {format_duration(eta)}"
+    return text
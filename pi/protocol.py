@@ -0,0 +1,27 @@
+import struct
+
+VERSION = 1
+HEADER = struct.Struct("!BII")
+LIMIT = 16 << 20
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode(id, *fields):
+    payload = "\0".join(fields).encode()
+    return HEADER.pack(VERSION, id, len(payload)) + payload
+
+
+def decode(payload):
+    return payload.decode().split("\0") if payload else []
+
+
+def parse(header):
+    version, id, length = HEADER.unpack(header)
+    if version != VERSION:
+        raise ProtocolError(f"unsupported protocol version {version}")
+    if length > LIMIT:
+        raise ProtocolError(f"frame of {length} bytes is too large")
+    return id, length
@@ -0,0 +1,80 @@
+import os
+import tkinter as tk
+
+from tkinter import ttk
+
+from pi.explorer import Explorer
+
+
+class Results(ttk.Frame):
+    def __init__(self, parent, callback, interval=100):
+        super().__init__(parent)
+        self.callback = callback
+        self.interval = interval
+        self.search = None
+        self.matches = []
+        self.label = ttk.Label(self)
+        self.label.pack(fill=tk.X, padx=4, pady=(4, 0))
+        self.box = Explorer(self, activestyle="none")
+        self.box.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        self.box.bind("<Double-1>", self.choose)
+        self.box.bind("<Return>", self.choose)
+        self.box.bind("<Right>", self.choose)
+        self.polling = None
+
+    def start(self, search, query):
+        self.search = search
+        self.query = query
+        self.matches = []
+        self.box.set_items([])
+        self.describe("Searching")
+        if not self.polling:
+            self.polling = self.after(self.interval, self.poll)
+
+    def describe(self, status):
+        count = len(self.matches)
+        self.label.config(
+            text=f"{status} {self.query!r} in {self.search.root}: {count} matches"
+        )
+
+    def poll(self):
+        self.polling = None
+        search = self.search
+        items = []
+        finished = False
+        while not search.results.empty():
+            matches = search.results.get()
+            if matches is None:
+                finished = True
+                break
+            self.matches.extend(matches)
+            items.extend(
+                f"{os.path.relpath(path, search.root)}:{line}: {text}"
+                for path, line, text in matches
+            )
+        if items:
+            first = not self.box.size()
+            self.box.insert(tk.END, *items)
+            if first:
+                self.box.selection_set(0)
+                self.box.activate(0)
+        if finished:
+            self.describe("Found")
+        else:
+            self.describe("Searching")
+            self.polling = self.after(self.interval, self.poll)
+
+    def stop(self):
+        if self.polling:
+            self.after_cancel(self.polling)
+            self.polling = None
+
+    def destroy(self):
+        self.stop()
+        super().destroy()
+
+    def choose(self, event=None):
+        if not self.matches:
+            return
+        path, line, text = self.matches[self.box.index(tk.ACTIVE)]
+        self.callback(path, line)
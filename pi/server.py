@@ -1,65 +1,96 @@
+import asyncio
 import atexit
 import os
-import socket
+import queue
 import threading
 
-SOCKET_PATH = "/tmp/pi.sock"
-sock = None
+from concurrent.futures import Future
 
-
-def is_running():
-    if not os.path.exists(SOCKET_PATH):
-        return False
-    try:
-        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        s.settimeout(1)
-        s.connect(SOCKET_PATH)
-        s.send(b"ping")
-        s.close()
-        return True
-    except:
-        try:
-            os.remove(SOCKET_PATH)
-        except:
-            pass
-        return False
+from pi.client import SOCKET_PATH
+from pi.protocol import HEADER, ProtocolError, decode, encode, parse
 
 
-def send(path):
-    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-    s.connect(SOCKET_PATH)
-    s.send(path.encode())
-    s.close()
+class Server:
+    def __init__(self, handler, address=SOCKET_PATH, wake=None):
+        self.handler = handler
+        self.address = address
+        self.wake = wake
+        self.pending = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.loop = asyncio.new_event_loop()
+        if os.path.exists(address):
+            os.remove(address)
+        ready = threading.Event()
+        thread = threading.Thread(target=self.run, args=(ready,), daemon=True)
+        thread.start()
+        ready.wait()
 
+    def run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        server = asyncio.start_unix_server(self.serve, self.address)
+        self.server = self.loop.run_until_complete(server)
+        ready.set()
+        self.loop.run_forever()
 
-def cleanup():
-    global sock
-    if sock:
-        sock.close()
-    if os.path.exists(SOCKET_PATH):
-        os.remove(SOCKET_PATH)
-
+    async def serve(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                id, length = parse(await reader.readexactly(HEADER.size))
+                command, *args = decode(await reader.readexactly(length)) or [""]
+                task = asyncio.create_task(self.respond(writer, id, command, args))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            writer.write(encode(0, "error", str(e)))
+        finally:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
 
-def start(callback):
-    global sock
-    if os.path.exists(SOCKET_PATH):
-        os.remove(SOCKET_PATH)
+    async def respond(self, writer, id, command, args):
+        try:
+            if command == "ping":
+                fields = []
+            else:
+                future = Future()
+                self.pending.put((command, args, future))
+                self.schedule()
+                fields = await asyncio.wrap_future(future)
+            writer.write(encode(id, "ok", *fields))
+        except Exception as e:
+            writer.write(encode(id, "error", str(e)))
+        await writer.drain()
 
-    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-    sock.bind(SOCKET_PATH)
-    sock.listen(5)
-    atexit.register(cleanup)
+    def schedule(self):
+        with self.lock:
+            if self.scheduled or not self.wake:
+                return
+            self.scheduled = True
+        self.wake(self.drain)
 
-    def listen():
+    def drain(self):
+        with self.lock:
+            self.scheduled = False
         while True:
             try:
-                conn, _ = sock.accept()
-                path = conn.recv(4096).decode()
-                if path and path != "ping":
-                    callback(path)
-                conn.close()
-            except:
-                break
+                command, args, future = self.pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                future.set_result(self.handler(command, args) or [])
+            except Exception as e:
+                future.set_exception(e)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.server.close)
+        if os.path.exists(self.address):
+            os.remove(self.address)
+
 
-    thread = threading.Thread(target=listen, daemon=True)
-    thread.start()
+def start(handler, address=SOCKET_PATH, wake=None):
+    server = Server(handler, address, wake)
+    atexit.register(server.close)
+    return server
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+
+from pathlib import Path
+
+from pi.core import Entry
+
+STATE = Path.home() / ".config" / "pi" / "state"
+LISTINGS = STATE.with_name("listings")
+VERSION = 1
+
+
+def encode(tabs, current=0):
+    tabs = [{k: v for k, v in tab.items() if k != "entries"} for tab in tabs]
+    state = {"version": VERSION, "current": current, "tabs": tabs}
+    return json.dumps(state, separators=(",", ":"))
+
+
+def decode(text):
+    try:
+        state = json.loads(text)
+    except ValueError:
+        return [{"dir": dir} for dir in text.split("\n") if dir], 0
+    if not isinstance(state, dict) or state.get("version") != VERSION:
+        return [], 0
+    tabs = state.get("tabs", [])
+    for tab in tabs:
+        tab.pop("entries", None)
+    return tabs, state.get("current", 0)
+
+
+def listing_path(dir, root=LISTINGS):
+    return Path(root) / hashlib.sha1(os.fsencode(dir)).hexdigest()
+
+
+def encode_listing(dir, entries):
+    entries = [list(entry) for entry in entries]
+    return json.dumps({"dir": dir, "entries": entries}, separators=(",", ":"))
+
+
+def decode_listing(dir, text):
+    try:
+        listing = json.loads(text)
+        if listing["dir"] != dir:
+            return None
+        return [Entry(*entry) for entry in listing["entries"]]
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def hibernating(live, current, tabs, rows):
+    count, total = len(live), sum(size for _, size in live)
+    chosen = []
+    for tab, size in live:
+        if count <= tabs and total <= rows:
+            break
+        if tab == current:
+            continue
+        chosen.append(tab)
+        count -= 1
+        total -= size
+    return chosen
+
+
+def load(path=STATE):
+    try:
+        return decode(Path(path).read_text())
+    except (OSError, TypeError):
+        return [], 0
+
+
+def load_listing(dir, root=LISTINGS):
+    try:
+        return decode_listing(dir, listing_path(dir, root).read_text())
+    except OSError:
+        return None
+
+
+def write(text, path=STATE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(temp, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp, path)
+
+
+class Writer:
+    def __init__(self, path=STATE, root=LISTINGS, rows=20000):
+        self.path = path
+        self.root = root
+        self.rows = rows
+        self.condition = threading.Condition()
+        self.pending = None
+        self.busy = False
+        self.written = {}
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def save(self, tabs, current=0, listings=None):
+        with self.condition:
+            self.pending = (tabs, current, listings or {})
+            self.condition.notify_all()
+
+    def flush(self):
+        with self.condition:
+            self.condition.wait_for(lambda: not self.pending and not self.busy)
+
+    def listing(self, dir):
+        entries = load_listing(dir, self.root)
+        if entries is not None:
+            with self.condition:
+                self.written.setdefault(dir, entries)
+        return entries
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                tabs, current, listings = self.pending
+                self.pending = None
+                self.busy = True
+            try:
+                write(encode(tabs, current), self.path)
+                self.write_listings(listings)
+            except OSError as e:
+                print(f"Cannot save session: {e}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def write_listings(self, listings):
+        for dir, entries in listings.items():
+            with self.condition:
+                if entries is None or self.written.get(dir) is entries:
+                    continue
+                self.written[dir] = entries
+            path = listing_path(dir, self.root)
+            if len(entries) > self.rows:
+                path.unlink(missing_ok=True)
+            else:
+                write(encode_listing(dir, entries), path)
+        with self.condition:
+            closed = [dir for dir in self.written if dir not in listings]
+            for dir in closed:
+                del self.written[dir]
+        for dir in closed:
+            listing_path(dir, self.root).unlink(missing_ok=True)
@@ -40,5 +40,5 @@ class Tab(ttk.Notebook):
             tab = self.select()
         if len(self.tabs()) > 1:
             self.forget(tab)
-            self.parent.data.pop(tab)
+            self.parent.forget_tab(tab)
             self.parent.tab_activated()
@@ -0,0 +1,19 @@
+PROBE = 8192
+
+
+def binary(data):
+    return b"\0" in data[:PROBE]
+
+
+def fold(text):
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "\n".join(fold_line(line) for line in text.split("\n"))
+
+
+def fold_line(line):
+    folded = line.lower()
+    if len(folded) == len(line):
+        return folded
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in line)
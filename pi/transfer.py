@@ -0,0 +1,150 @@
+import errno
+import fcntl
+import os
+import shutil
+import stat
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+FICLONE = 0x40049409
+CHUNK = 8 << 20
+BATCH = 256
+UNSUPPORTED = {errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.EXDEV, errno.ENOTTY}
+
+
+def nothing(*args, **kwargs):
+    pass
+
+
+def clone(src, dst):
+    try:
+        fcntl.ioctl(dst, FICLONE, src)
+        return True
+    except OSError as e:
+        if e.errno in UNSUPPORTED:
+            return False
+        raise
+
+
+def splice(src, dst, size, progress, check):
+    copied = 0
+    for method in ("copy_file_range", "sendfile"):
+        if not hasattr(os, method):
+            continue
+        try:
+            while copied < size:
+                check()
+                count = min(CHUNK, size - copied)
+                if method == "copy_file_range":
+                    sent = os.copy_file_range(src, dst, count)
+                else:
+                    sent = os.sendfile(dst, src, copied, count)
+                if not sent:
+                    break
+                copied += sent
+                progress(bytes=sent)
+            return copied
+        except OSError as e:
+            if copied or e.errno not in UNSUPPORTED:
+                raise
+    return copied
+
+
+def copy_file(source, target, progress=nothing, check=nothing):
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            copy_data(src, dst, progress, check)
+        except BaseException:
+            os.remove(target)
+            raise
+    shutil.copystat(source, target)
+
+
+def copy_data(src, dst, progress=nothing, check=nothing):
+    size = os.fstat(src.fileno()).st_size
+    if size and clone(src.fileno(), dst.fileno()):
+        progress(bytes=size)
+        copied = size
+    else:
+        copied = splice(src.fileno(), dst.fileno(), size, progress, check)
+    os.lseek(src.fileno(), copied, os.SEEK_SET)
+    os.lseek(dst.fileno(), copied, os.SEEK_SET)
+    while chunk := src.read(CHUNK):
+        check()
+        dst.write(chunk)
+        progress(bytes=len(chunk))
+
+
+def copy(source, target, progress=nothing, check=nothing, workers=4):
+    info = os.lstat(source)
+    if not stat.S_ISDIR(info.st_mode):
+        copy_entry(source, target, info, progress, check)
+        return
+    dirs = []
+    try:
+        copy_tree(source, target, dirs, progress, check, workers)
+    except BaseException:
+        if dirs:
+            shutil.rmtree(target, ignore_errors=True)
+        raise
+    for src, dst in reversed(dirs):
+        shutil.copystat(src, dst)
+
+
+def copy_tree(source, target, dirs, progress=nothing, check=nothing, workers=4):
+    with ThreadPoolExecutor(workers, thread_name_prefix="pi-copy") as executor:
+        futures = []
+        batch = []
+        size = 0
+        try:
+            for src, dst, info in walk(source, target):
+                check()
+                if stat.S_ISDIR(info.st_mode):
+                    os.mkdir(dst)
+                    dirs.append((src, dst))
+                    progress(files=1)
+                    continue
+                batch.append((src, dst, info))
+                size += info.st_size
+                if len(batch) >= BATCH or size >= CHUNK:
+                    futures.append(executor.submit(copy_batch, batch, progress, check))
+                    batch, size = [], 0
+            futures.append(executor.submit(copy_batch, batch, progress, check))
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+
+
+def copy_batch(batch, progress=nothing, check=nothing):
+    for source, target, info in batch:
+        copy_entry(source, target, info, progress, check)
+
+
+def copy_entry(source, target, info, progress=nothing, check=nothing):
+    check()
+    if stat.S_ISLNK(info.st_mode):
+        os.symlink(os.readlink(source), target)
+        shutil.copystat(source, target, follow_symlinks=False)
+    elif not stat.S_ISREG(info.st_mode):
+        raise shutil.SpecialFileError(f"{source} is not a regular file")
+    else:
+        copy_file(source, target, progress, check)
+    progress(files=1)
+
+
+def walk(source, target):
+    stack = [(source, target)]
+    yield source, target, os.lstat(source)
+    while stack:
+        src, dst = stack.pop()
+        with os.scandir(src) as it:
+            for entry in it:
+                info = entry.stat(follow_symlinks=False)
+                path = os.path.join(dst, entry.name)
+                yield entry.path, path, info
+                if stat.S_ISDIR(info.st_mode):
+                    stack.append((entry.path, path))
@@ -1,16 +1,18 @@
 #!/usr/bin/env python
 
-import psutil
-import time
 import tkinter as tk
 
+from pi.metrics import Sampler, sources
+from pi.utils import format_size
+
 
 BG = "#222222"
 FG = "#ffffff"
+INTERVALS = {"clock": 1, "battery": 30, "cpu": 2, "memory": 5, "load": 5, "io": 2}
 
 
 class Tray(tk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, intervals=INTERVALS):
         super().__init__(parent, bg=BG)
         self.pack(fill="x", anchor="e")
         self.clock_label = tk.Label(self, bg=BG, fg=FG)
@@ -19,26 +21,47 @@ class Tray(tk.Frame):
         self.charge_label.pack(side="right", padx=(0, 2))
         self.percent_label = tk.Label(self, bg=BG, fg=FG)
         self.percent_label.pack(side="right", padx=2)
-        self.after(1000, self.refresh)
+        self.io_label = tk.Label(self, bg=BG, fg=FG)
+        self.io_label.pack(side="right", padx=4)
+        self.load_label = tk.Label(self, bg=BG, fg=FG)
+        self.load_label.pack(side="right", padx=4)
+        self.memory_label = tk.Label(self, bg=BG, fg=FG)
+        self.memory_label.pack(side="right", padx=4)
+        self.cpu_label = tk.Label(self, bg=BG, fg=FG)
+        self.cpu_label.pack(side="right", padx=4)
+        self.sampler = Sampler(sources(), intervals).start()
+        self.after(250, self.refresh)
 
     def refresh(self):
-        self.update_clock()
-        self.update_battery()
-        self.after(1000, self.refresh)
+        for name, value in self.sampler.changed().items():
+            getattr(self, f"update_{name}")(value)
+        self.after(250, self.refresh)
 
-    def update_clock(self):
-        self.clock_label.config(text=time.strftime("%H:%M:%S"))
+    def update_clock(self, value):
+        self.clock_label.config(text=value)
 
-    def update_battery(self):
-        battery = psutil.sensors_battery()
+    def update_battery(self, battery):
         if not battery:
             return
-        plugged = battery.power_plugged
-        percent = battery.percent
-        self.percent_label.config(text=f"{int(percent)}%")
+        percent, plugged = battery
+        self.percent_label.config(text=f"{percent}%")
         color = "green" if percent > 50 else "orange" if percent > 20 else "red"
         self.charge_label.config(text="⬆" if plugged else "⬇", fg=color)
 
+    def update_cpu(self, value):
+        self.cpu_label.config(text=f"cpu {value}%" if value is not None else "")
+
+    def update_memory(self, value):
+        self.memory_label.config(text=f"mem {value}%" if value is not None else "")
+
+    def update_load(self, value):
+        self.load_label.config(text=" ".join(map(str, value)) if value else "")
+
+    def update_io(self, value):
+        if value:
+            read, write = map(format_size, value)
+            self.io_label.config(text=f"io {read}/{write}")
+
 
 if __name__ == "__main__":
     root = tk.Tk()
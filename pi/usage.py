@@ -0,0 +1,112 @@
+import os
+import stat
+import threading
+
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from queue import SimpleQueue
+
+Node = namedtuple("Node", "mtime size files subdirs links")
+
+
+def blocks(info):
+    return info.st_blocks * 512
+
+
+class Usage:
+    def __init__(self, workers=8, capacity=100000):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="pi-usage")
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.nodes = OrderedDict()
+
+    def node(self, path):
+        info = os.lstat(path)
+        mtime = info.st_mtime_ns
+        with self.lock:
+            cached = self.nodes.get(path)
+            if cached and cached.mtime == mtime:
+                self.nodes.move_to_end(path)
+                return cached
+        size, files, subdirs, links = blocks(info), 0, [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(info.st_mode):
+                    subdirs.append((entry.name, info.st_dev))
+                elif info.st_nlink > 1:
+                    links.append((info.st_dev, info.st_ino, blocks(info)))
+                else:
+                    size += blocks(info)
+                    files += 1
+        node = Node(mtime, size, files, tuple(subdirs), tuple(links))
+        with self.lock:
+            self.nodes[path] = node
+            self.nodes.move_to_end(path)
+            while len(self.nodes) > self.capacity:
+                self.nodes.popitem(last=False)
+        return node
+
+    def scan(self, dir, names):
+        scan = Scan(self, dir, names)
+        scan.start()
+        return scan
+
+
+class Scan:
+    def __init__(self, usage, dir, names):
+        self.usage = usage
+        self.dir = dir
+        self.device = os.lstat(dir).st_dev
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.seen = set()
+        self.totals = {name: [0, 0, 1] for name in names}
+        self.remaining = len(self.totals)
+        self.results = SimpleQueue()
+
+    def start(self):
+        for name in self.totals:
+            self.submit(os.path.join(self.dir, name), name)
+        if not self.totals:
+            self.results.put(None)
+
+    def submit(self, path, name):
+        self.usage.executor.submit(self.visit, path, name)
+
+    def visit(self, path, name):
+        if self.cancelled.is_set():
+            return
+        try:
+            node = self.usage.node(path)
+        except Exception:
+            node = Node(0, 0, 0, (), ())
+        subdirs = [
+            os.path.join(path, subdir)
+            for subdir, device in node.subdirs if device == self.device
+        ]
+        with self.lock:
+            total = self.totals[name]
+            total[0] += node.size
+            total[1] += node.files
+            for device, inode, size in node.links:
+                if (device, inode) not in self.seen:
+                    self.seen.add((device, inode))
+                    total[0] += size
+                    total[1] += 1
+            total[2] += len(subdirs) - 1
+            finished = not total[2]
+            if finished:
+                self.remaining -= 1
+        for subdir in subdirs:
+            self.submit(subdir, name)
+        if finished:
+            self.results.put((name, total[0], total[1]))
+            if not self.remaining:
+                self.results.put(None)
+
+    def cancel(self):
+        self.cancelled.set()
@@ -2,11 +2,8 @@ import os
 import sys
 
 from contextlib import contextmanager
-from pathlib import Path
 from tkinter import messagebox
 
-STATE = Path.home() / ".config" / "pi" / "state"
-
 
 @contextmanager
 def cd(dir):
@@ -29,12 +26,14 @@ def quit(event=None):
         sys.exit(0)
 
 
-def save_state(tabs):
-    STATE.parent.mkdir(parents=True, exist_ok=True)
-    STATE.write_text("\n".join(tabs))
+def format_size(size):
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
 
 
-def load_state():
-    if STATE.exists():
-        return [p for p in STATE.read_text().split("\n") if p]
-    return []
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
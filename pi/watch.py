@@ -0,0 +1,132 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+EVENT = struct.Struct("iIII")
+
+
+class Inotify:
+    def __init__(self, callback):
+        self.callback = callback
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.lock = threading.Lock()
+        self.paths = {}
+        self.watches = {}
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def watch(self, path):
+        with self.lock:
+            if path in self.watches:
+                return
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), MASK)
+            if wd < 0:
+                return
+            self.paths[wd] = path
+            self.watches[path] = wd
+
+    def unwatch(self, path):
+        with self.lock:
+            wd = self.watches.pop(path, None)
+            if wd is not None:
+                self.paths.pop(wd, None)
+                self.libc.inotify_rm_watch(self.fd, wd)
+
+    def run(self):
+        while True:
+            select.select([self.fd], [], [])
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                continue
+            for path in self.changed(data):
+                self.callback(path)
+
+    def changed(self, data):
+        changed = set()
+        for wd, mask in self.events(data):
+            with self.lock:
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.watches)
+                    continue
+                path = self.paths.get(wd)
+                if mask & IN_IGNORED and path:
+                    self.paths.pop(wd, None)
+                    self.watches.pop(path, None)
+            if path:
+                changed.add(path)
+        return changed
+
+    def events(self, data):
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT.unpack_from(data, offset)
+            yield wd, mask
+            offset += EVENT.size + length
+
+
+class Poller:
+    def __init__(self, callback, interval=2):
+        self.callback = callback
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.watches = {}
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def watch(self, path):
+        with self.lock:
+            if path not in self.watches:
+                self.watches[path] = self.stamp(path)
+
+    def unwatch(self, path):
+        with self.lock:
+            self.watches.pop(path, None)
+
+    def stamp(self, path):
+        try:
+            info = os.stat(path)
+            return info.st_mtime_ns, info.st_ino
+        except OSError:
+            return None
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                paths = list(self.watches.items())
+            for path, stamp in paths:
+                current = self.stamp(path)
+                if current != stamp:
+                    with self.lock:
+                        if path in self.watches:
+                            self.watches[path] = current
+                    self.callback(path)
+
+
+def watcher(callback, interval=2):
+    try:
+        return Inotify(callback)
+    except (AttributeError, OSError):
+        return Poller(callback, interval)
@@ -0,0 +1,84 @@
+import os
+import pytest
+import shutil
+import time
+
+from pi import watch
+from pi.cache import Cache
+from pi.core import Entry, Folder
+
+
+@pytest.fixture()
+def folder():
+    os.mkdir("folder")
+    yield
+    shutil.rmtree("folder")
+
+
+def wait(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestCache():
+    def test_get(self, folder):
+        cache = Cache(interval=0.05)
+        Folder("folder").create_file("file")
+        assert [e.name for e in cache.get("folder")] == ["file"]
+        assert cache.get("folder") is cache.get("folder")
+
+    def test_revalidate(self, folder):
+        cache = Cache(interval=0.05)
+        cache.seed("missing", [Entry("ghost", "file", False, False, False, 0, 0, 0)])
+        with pytest.raises(OSError):
+            cache.revalidate("missing")
+        assert cache.peek("missing") is None
+        assert cache.changes() == {"missing"}
+        with pytest.raises(OSError):
+            cache.get("missing")
+
+    def test_changes(self, folder):
+        cache = Cache(interval=0.05)
+        cache.get("folder")
+        Folder("folder").create_file("file")
+        assert wait(lambda: "folder" in cache.dirty)
+        assert cache.changes() == {"folder"}
+        assert "folder" not in cache.watcher.watches
+        assert [e.name for e in cache.get("folder")] == ["file"]
+        assert "folder" in cache.watcher.watches
+
+    def test_generations(self, folder, monkeypatch):
+        cache = Cache(interval=0.05)
+        scan = Folder.scan
+
+        def marking(self, *args, **kwargs):
+            cache.mark("elsewhere")
+            if self.dir == "folder/b":
+                cache.invalidate("folder/b")
+            return scan(self, *args, **kwargs)
+
+        os.mkdir("folder/a")
+        os.mkdir("folder/b")
+        monkeypatch.setattr(Folder, "scan", marking)
+        cache.get("folder/a")
+        cache.get("folder/b")
+        assert list(cache.listings) == ["folder/a"]
+
+    def test_evict(self, folder):
+        cache = Cache(shown=lambda: {"folder/a"}, capacity=2)
+        for name in "abc":
+            Folder("folder").create_folder(name)
+            cache.get(os.path.join("folder", name))
+        assert list(cache.listings) == ["folder/a", "folder/c"]
+
+    def test_overflow(self, folder):
+        os.mkdir("folder/a")
+        cache = Cache(interval=0.05)
+        if not isinstance(cache.watcher, watch.Inotify):
+            pytest.skip("inotify unavailable")
+        cache.get("folder")
+        cache.get("folder/a")
+        event = watch.EVENT.pack(-1, watch.IN_Q_OVERFLOW, 0, 0)
+        assert cache.watcher.changed(event) == {"folder", "folder/a"}
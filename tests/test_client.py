@@ -0,0 +1,89 @@
+import os
+import pytest
+import subprocess
+import sys
+import threading
+
+from pi import client, server
+from pi.protocol import ProtocolError
+
+HEAVY = {"tkinter", "psutil", "threading", "asyncio", "json", "pi.main", "pi.server"}
+
+
+@pytest.fixture()
+def listener():
+    requests = []
+
+    def handler(command, args):
+        requests.append((command, args))
+        if command == "fail":
+            raise ProtocolError("failed")
+        return args[::-1]
+
+    address = f"/tmp/pi-test-{os.getpid()}.sock"
+    listener = server.Server(handler, address)
+    listener.requests = requests
+    stop = threading.Event()
+
+    def drain():
+        while not stop.wait(0.005):
+            listener.drain()
+
+    thread = threading.Thread(target=drain)
+    thread.start()
+    yield listener
+    stop.set()
+    thread.join()
+    listener.close()
+
+
+class TestClient():
+    def test_imports(self):
+        code = "import sys, pi.client; print(' '.join(sys.modules))"
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert not HEAVY & set(output.split())
+
+    def test_forward(self, listener):
+        assert client.forward(["/a", "/b c"], listener.address)
+        assert listener.requests == [("batch-open", ["/a", "/b c"])]
+        assert not client.forward(["/a"], listener.address + ".missing")
+
+    def test_timeout(self):
+        address = f"/tmp/pi-test-{os.getpid()}-busy.sock"
+        listener = server.Server(lambda command, args: args, address)
+        try:
+            with pytest.raises(ProtocolError):
+                client.forward(["/a"], address, timeout=0.2)
+        finally:
+            listener.close()
+
+    def test_wake(self):
+        address = f"/tmp/pi-test-{os.getpid()}-wake.sock"
+        wakes = []
+
+        def wake(drain):
+            wakes.append(drain)
+            threading.Timer(0.01, drain).start()
+
+        listener = server.Server(lambda command, args: args, address, wake)
+        try:
+            with client.Connection(address) as connection:
+                ids = [connection.send("list", str(i)) for i in range(50)]
+                for i, id in enumerate(ids):
+                    assert connection.receive(id) == [str(i)]
+            assert 1 <= len(wakes) < 50
+        finally:
+            listener.close()
+
+    def test_pipeline(self, listener):
+        with client.Connection(listener.address) as connection:
+            ids = [connection.send("list", str(i), "x") for i in range(100)]
+            failed = connection.send("fail")
+            assert connection.request("ping") == []
+            for i, id in reversed(list(enumerate(ids))):
+                assert connection.receive(id) == ["x", str(i)]
+            with pytest.raises(ProtocolError):
+                connection.receive(failed)
+        assert len(listener.requests) == 101
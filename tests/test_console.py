@@ -0,0 +1,62 @@
+import queue
+import threading
+import time
+
+from pi.console import Buffer, Console
+
+
+class TestConsole():
+    def test_buffer(self):
+        buffer = Buffer(limit=3)
+        assert buffer.write("a\nb") == 3
+        buffer.write("\nc\n")
+        assert buffer.take() == "a\nb\nc\n"
+        assert buffer.take() == ""
+
+    def test_scrollback(self):
+        buffer = Buffer(limit=2)
+        for i in range(100):
+            buffer.write(f"{i}\n")
+        assert buffer.take() == "98\n99\n"
+
+    def test_threads(self):
+        buffer = Buffer(limit=100000)
+        threads = [
+            threading.Thread(target=lambda: [buffer.write("x\n") for _ in range(1000)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert buffer.take().count("\n") == 4000
+
+    def test_interrupt(self):
+        console = Console.__new__(Console)
+        console.buffer = Buffer()
+        console.commands = queue.SimpleQueue()
+        console.locals = {}
+        console.running = None
+        console.interrupted = False
+        console.lock = threading.Lock()
+        console.worker = threading.Thread(target=console.work, daemon=True)
+        console.worker.start()
+        stop = threading.Event()
+
+        def spam():
+            while not stop.is_set():
+                console.interrupt()
+
+        spammer = threading.Thread(target=spam)
+        spammer.start()
+        for i in range(2000):
+            console.commands.put(f"x = {i}")
+        time.sleep(0.2)
+        stop.set()
+        spammer.join()
+        console.commands.put("after = True")
+        deadline = time.monotonic() + 5
+        while "after" not in console.locals and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert console.worker.is_alive()
+        assert console.locals.get("after")
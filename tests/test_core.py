@@ -2,7 +2,7 @@ import os
 import pytest
 import shutil
 
-from pi.core import Folder
+from pi.core import Folder, compile_command, exec_with_return
 from pi.utils import cd
 
 
@@ -23,3 +23,36 @@ class TestFolder():
         assert f.get_file_type("file") == "file"
         assert f.get_file_type("folder") == "folder"
         assert f.get_file_type("link") == "active_link"
+
+    def test_scan(self, folder):
+        f = Folder("folder")
+        f.create_file("file")
+        f.create_file(".hidden")
+        f.create_folder("folder")
+        f.create_link("file", name="link")
+        f.create_link("missing", name="broken")
+        os.chmod(os.path.join("folder", "file"), 0o755)
+        entries = {entry.name: entry for entry in f.scan()}
+        assert sorted(entries) == ["broken", "file", "folder", "link"]
+        assert entries["file"].type == "executable"
+        assert entries["folder"].type == "folder"
+        assert entries["link"].type == "active_link"
+        assert entries["link"].link
+        assert entries["broken"].type == "broken_link"
+        names = [e.name for e in f.scan(hidden=True, pattern="d")]
+        assert names == [".hidden", "folder"]
+
+
+class TestExecWithReturn():
+    def test_expression(self):
+        assert exec_with_return("1 + 2", {}, {}) == 3
+
+    def test_assign(self):
+        locals = {}
+        assert exec_with_return("x = [1]\nx[0] = 5", {}, locals) == 5
+        assert exec_with_return("y: int = 2", {}, locals) == 2
+        assert exec_with_return("x += [2]", {}, locals) == [5, 2]
+        assert exec_with_return("import os", {}, locals) is None
+
+    def test_cache(self):
+        assert compile_command("a = 1") is compile_command("a = 1")
@@ -0,0 +1,55 @@
+import os
+import pytest
+import re
+import shutil
+
+from pi.grep import Grep, compile_pattern, grep_file
+
+
+@pytest.fixture()
+def folder():
+    os.makedirs("folder/nested")
+    os.mkdir("folder/.git")
+    with open("folder/a.txt", "w") as file:
+        file.write("one\nTwo two\nthree\ntwo\n")
+    with open("folder/nested/b.txt", "w") as file:
+        file.write("no match\nsecond two")
+    with open("folder/binary", "wb") as file:
+        file.write(b"two\0")
+    with open("folder/.git/config", "w") as file:
+        file.write("two")
+    open("folder/empty", "w").close()
+    yield "folder"
+    shutil.rmtree("folder")
+
+
+def collect(search):
+    matches = []
+    while (result := search.results.get(timeout=30)) is not None:
+        matches.extend(result)
+    return sorted(matches)
+
+
+class TestGrep():
+    def test_file(self, folder):
+        pattern = re.compile(b"two", re.IGNORECASE)
+        assert grep_file("folder/a.txt", pattern) == [
+            ("folder/a.txt", 2, "Two two"),
+            ("folder/a.txt", 4, "two"),
+        ]
+        assert grep_file("folder/binary", pattern) == []
+        assert grep_file("folder/empty", pattern) == []
+
+    def test_pattern(self):
+        assert compile_pattern("a.b") == (re.escape("a.b"), re.M | re.I)
+        assert compile_pattern("/A.b/") == ("A.b", re.M)
+
+    def test_search(self, folder):
+        grep = Grep(workers=2, ignore={".git"})
+        matches = collect(grep.start(folder, "/^two|second/"))
+        assert matches == [
+            ("folder/a.txt", 2, "Two two"),
+            ("folder/a.txt", 4, "two"),
+            ("folder/nested/b.txt", 2, "second two"),
+        ]
+        grep.executor.shutdown()
@@ -0,0 +1,82 @@
+import random
+
+from pi.highlight import Highlighter, lex
+
+
+class TestHighlight():
+    def test_lex(self):
+        tokens, state = lex("def f(x=1):  # note")
+        assert tokens == [
+            ("keyword", 0, 3),
+            ("definition", 4, 5),
+            ("number", 8, 9),
+            ("comment", 13, 19),
+        ]
+        assert state == ""
+        assert lex('s = """doc', "") == ([("string", 4, 10)], '"""')
+        assert lex("m = re.match(p, type(x)) for _ in s") == (
+            [("keyword", 25, 28), ("keyword", 31, 33)], ""
+        )
+        assert lex('end""" or 2', '"""') == (
+            [("string", 0, 6), ("keyword", 7, 9), ("number", 10, 11)], ""
+        )
+
+    def test_converge(self):
+        lines = ["x = 1", 's = """', "inside", '"""'] * 100
+        seen = []
+
+        def text(line):
+            seen.append(line)
+            return lines[line] if line < len(lines) else None
+
+        highlighter = Highlighter()
+        highlighter.highlight(0, 399, text)
+        assert highlighter.known == 400
+        seen.clear()
+        lines[200] = "x = 2"
+        highlighter.edit(200, 0, 0)
+        tokens = highlighter.highlight(200, 200, text)
+        assert seen == [200]
+        assert tokens == [(200, "number", 4, 5)]
+        assert highlighter.known == 400
+
+    def test_propagate(self):
+        lines = ["x = 1"] * 10
+        highlighter = Highlighter()
+        highlighter.highlight(0, 9, lines.__getitem__)
+        lines.insert(3, 'y = """')
+        highlighter.edit(2, 0, 1)
+        tokens = highlighter.highlight(0, 10, lines.__getitem__)
+        assert (9, "string", 0, 5) in tokens
+        assert highlighter.states[5] == '"""'
+
+    def test_sync(self):
+        lines = ["x = 1"] * 10000
+        seen = []
+        highlighter = Highlighter(sync=100)
+        highlighter.highlight(9000, 9010, lambda line: seen.append(line) or lines[line])
+        assert seen[0] == 9000
+
+    def test_fuzz(self):
+        choices = [
+            "x = 1", 's = """', '"""', "y = 'a'", "# c", 'a = """b"""', "def f():"
+        ]
+        for seed in range(1000):
+            rng = random.Random(seed)
+            lines = [rng.choice(choices) for _ in range(rng.randint(1, 30))]
+            highlighter = Highlighter(sync=10000)
+            for _ in range(rng.randint(1, 15)):
+                if rng.random() < 0.5:
+                    line = rng.randrange(len(lines))
+                    removed = rng.randint(0, min(3, len(lines) - line - 1))
+                    added = rng.randint(0, 3)
+                    new = [rng.choice(choices) for _ in range(added + 1)]
+                    lines[line:line + removed + 1] = new
+                    highlighter.edit(line, removed, added)
+                else:
+                    lo = rng.randrange(len(lines))
+                    hi = rng.randrange(lo, len(lines))
+                    text = lines.__getitem__
+                    tokens = highlighter.highlight(lo, hi, text)
+                    expected = Highlighter(sync=10000).highlight(lo, hi, text)
+                    assert tokens == expected, seed
@@ -0,0 +1,45 @@
+import os
+import pytest
+import shutil
+
+from pi.core import Folder
+from pi.index import Index
+
+
+@pytest.fixture()
+def folder():
+    os.mkdir("folder")
+    f = Folder("folder")
+    f.create_folder("src")
+    f.create_folder("node_modules")
+    f.create_file(os.path.join("src", "main.py"))
+    f.create_file(os.path.join("src", "domain.py"))
+    f.create_file(os.path.join("node_modules", "main.js"))
+    f.create_file("README")
+    yield f
+    shutil.rmtree("folder")
+
+
+class TestIndex():
+    def test_search(self, folder):
+        index = Index("folder", path="folder.index", ignore={"node_modules"})
+        index.update()
+        assert index.search("main") == ["src/main.py", "src/domain.py"]
+        assert index.search("srcmai")[0] == "src/main.py"
+        assert index.search("dom") == ["src/domain.py"]
+        assert index.search("readme") == ["README"]
+        assert index.search("xyz") == []
+        assert index.resolve("src/") == "folder/src"
+
+    def test_update(self, folder):
+        index = Index("folder", path="folder.index")
+        index.refresh()
+        files = index.dirs["src"][1]
+        folder.create_file("new")
+        index.update()
+        assert index.dirs["src"][1] is files
+        assert index.search("new") == ["new"]
+        loaded = Index("folder", path="folder.index")
+        assert loaded.load()
+        assert "README" in loaded.dirs[""][1]
+        os.remove("folder.index")
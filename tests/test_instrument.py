@@ -0,0 +1,41 @@
+import json
+import os
+import tkinter
+
+from pi.instrument import Histogram, Stats, describe, install
+
+
+class TestInstrument():
+    def test_histogram(self):
+        histogram = Histogram()
+        for seconds in (0.0005, 0.003, 0.003, 0.3):
+            histogram.record(seconds)
+        summary = histogram.summary()
+        assert summary["count"] == 4
+        assert summary["p50"] == 0.005
+        assert summary["max"] == summary["p95"] == 0.3
+
+    def test_install(self):
+        original = tkinter.CallWrapper
+        stats = install(Stats())
+        try:
+            handler = tkinter.CallWrapper(lambda value: value * 2, None, None)
+            assert handler(21) == 42
+        finally:
+            tkinter.CallWrapper = original
+        [(name, summary)] = stats.summary().items()
+        assert name.startswith("lambda test_instrument.py:")
+        assert summary["count"] == 1
+        assert name[:40] in stats.report()
+
+    def test_export(self):
+        stats = Stats()
+        stats.record("App.open_file", 0.25)
+        path = stats.export(f"stats-{os.getpid()}.json")
+        with open(path) as file:
+            assert json.load(file)["handlers"]["App.open_file"]["count"] == 1
+        os.remove(path)
+
+    def test_describe(self):
+        assert describe(Stats().report) == "Stats.report"
+        assert describe(len) == "len"
@@ -0,0 +1,67 @@
+import errno
+import os
+import pytest
+import shutil
+
+from pi.core import Folder
+from pi.jobs import Job, Queue
+
+
+@pytest.fixture()
+def folder():
+    os.mkdir("folder")
+    f = Folder("folder")
+    f.create_folder("source")
+    f.create_folder(os.path.join("source", "nested"))
+    f.create_file(os.path.join("source", "nested", "file"))
+    with open(os.path.join("folder", "source", "data"), "wb") as file:
+        file.write(b"x" * 4096)
+    f.create_link(os.path.join("source", "data"), name=os.path.join("source", "link"))
+    yield f
+    shutil.rmtree("folder")
+
+
+class TestJob():
+    def test_copy(self, folder):
+        job = Job("copy", [("folder/source", "folder/target")])
+        job.run()
+        assert job.status == "done"
+        assert (job.files_done, job.files_total) == (5, 5)
+        assert job.bytes_done == job.bytes_total == 4096
+        assert os.path.islink("folder/target/link")
+        assert os.path.isfile("folder/target/nested/file")
+        assert job.touched == {"folder"}
+
+    def test_delete(self, folder):
+        job = Job("delete", [("folder/source", None)])
+        job.run()
+        assert job.status == "done"
+        assert os.listdir("folder") == []
+
+    def test_cancel(self, folder):
+        job = Job("delete", [("folder/source", None)])
+        job.cancel()
+        job.run()
+        assert job.status == "cancelled"
+        assert os.path.exists("folder/source")
+
+    def test_move_across_devices(self, folder, monkeypatch):
+        def rename(source, target):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(os, "rename", rename)
+        job = Job("move", [("folder/source/data", "folder/data")])
+        job.run()
+        assert job.status == "done"
+        assert (job.files_done, job.files_total) == (1, 1)
+        assert job.bytes_done == job.bytes_total == 4096
+        assert job.fraction() == 1
+        assert not os.path.exists("folder/source/data")
+
+    def test_queue(self, folder):
+        queue = Queue()
+        job = queue.submit(Job("move", [("folder/source", "folder/target")]))
+        queue.executor.shutdown()
+        assert queue.finished() == [job]
+        assert job.status == "done"
+        assert os.listdir("folder") == ["target"]
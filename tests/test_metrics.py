@@ -0,0 +1,31 @@
+import itertools
+import time
+
+from pi.metrics import Rate, Sampler
+
+
+class TestSampler():
+    def test_changed(self):
+        values = iter([1, 1, 2, 2, 2, 3])
+        sampler = Sampler({"value": lambda: next(values)}, {}, history=4)
+        for _ in range(3):
+            sampler.sample("value")
+        assert sampler.changed() == {"value": 2}
+        assert sampler.changed() == {}
+        for _ in range(3):
+            sampler.sample("value")
+        assert sampler.changed() == {"value": 3}
+        assert [value for _, value in sampler.series("value")] == [2, 2, 2, 3]
+
+    def test_thread(self):
+        counter = itertools.count()
+        sampler = Sampler({"fast": lambda: next(counter)}, {"fast": 0.01}).start()
+        time.sleep(0.1)
+        sampler.stop()
+        assert sampler.changed()["fast"] > 2
+
+    def test_rate(self):
+        totals = iter([(0,), (1 << 20,)])
+        rate = Rate(lambda: next(totals))
+        assert rate() is None
+        assert rate()[0] > 0
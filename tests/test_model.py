@@ -0,0 +1,103 @@
+from pi.core import Entry
+from pi.model import Filter, Listing, diff, sort
+from pi.text import fold
+
+
+def listing(*names):
+    entries = [Entry(name, "file", False, False, False, 0, 0, 0) for name in names]
+    return Listing("/dir", entries)
+
+
+class TestModel():
+    def test_paths(self):
+        model = listing("a", "b")
+        assert model.index("b") == 2
+        assert model.index("c") is None
+        assert model.paths([0, 1]) == ["/", "/dir/a"]
+        assert model.sources(range(len(model))) == ["/dir/a", "/dir/b"]
+
+    def test_find(self):
+        model = listing("Alpha", "beta", "gamma", "alphabet")
+        assert model.find("alp") == 1
+        assert model.find("alp", 2) == 4
+        assert model.find("alp", 5) == 1
+        assert model.find("^a") == 1
+        assert model.find("^b", 2) == 2
+        assert model.find("/M+A$/") == 3
+        assert model.find("delta") is None
+        model = listing("İstanbul", "Readme", "İNDEX")
+        assert model.find("read") == 2
+        assert model.find("ndex") == 3
+
+    def test_sort(self):
+        entries = [
+            Entry("b10.log", "file", False, False, False, 30, 3, 0),
+            Entry("b9.txt", "file", False, False, False, 10, 1, 0),
+            Entry("a", "folder", False, True, False, 20, 2, 0),
+        ]
+
+        def names(*args, **kwargs):
+            return [e.name for e in sort(entries, *args, **kwargs)]
+
+        assert names() == ["a", "b10.log", "b9.txt"]
+        assert names("natural") == ["a", "b9.txt", "b10.log"]
+        assert names("mtime") == ["b10.log", "a", "b9.txt"]
+        assert names("size", reverse=True) == ["b9.txt", "a", "b10.log"]
+        assert names("extension") == ["a", "b10.log", "b9.txt"]
+        assert names("mtime", dirs_first=True) == ["a", "b10.log", "b9.txt"]
+
+    def test_sort_ties(self):
+        entries = [Entry(name, "file", False, False, False, 1, 1, 0) for name in "cab"]
+        for mode in ("mtime", "size", "extension"):
+            for reverse in (False, True):
+                ordered = sort(entries, mode, reverse)
+                assert [e.name for e in ordered] == ["a", "b", "c"]
+                assert sort(entries[::-1], mode, reverse) == ordered
+
+    def test_diff(self):
+        old = listing("a", "b", "c", "d", "e").entries
+        new = listing("a", "c", "c2", "e", "f").entries
+        new[0] = new[0]._replace(type="folder")
+        assert diff(old, new) == ([(1, 2), (3, 4)], [(2, 3), (4, 5)], [0])
+
+    def test_diff_moves(self):
+        old = listing("a", "b", "c").entries
+        new = [old[1], old[2], old[0]]
+        deletes, inserts, updates = diff(old, new)
+        assert (deletes, inserts, updates) == ([(0, 1)], [(2, 3)], [])
+        names = [
+            e.name for i, e in enumerate(old) if not any(s <= i < t for s, t in deletes)
+        ]
+        for start, stop in inserts:
+            names[start:start] = [e.name for e in new[start:stop]]
+        assert names == ["b", "c", "a"]
+
+    def test_filter(self):
+        entries = listing(
+            "Readme.md", "report.txt", "src", "setup.py", "notes.txt"
+        ).entries
+        matcher = Filter(entries)
+
+        def names(query):
+            return [entries[i].name for i in matcher.match(query)]
+
+        assert names("r") == ["Readme.md", "report.txt", "src"]
+        assert names("rt") == ["report.txt"]
+        assert names("*.txt") == ["report.txt", "notes.txt"]
+        assert names("/^s/") == ["src", "setup.py"]
+        assert names("/^\\S+\\.TXT$/") == ["report.txt", "notes.txt"]
+        assert names("/^\\D+$/") == [e.name for e in entries]
+        assert names("") == [e.name for e in entries]
+
+    def test_filter_budget(self):
+        entries = listing(*(f"f{i}" for i in range(20000))).entries
+        matcher = Filter(entries)
+        while (indices := matcher.match("f1", budget=1e-9)) is None:
+            pass
+        assert len(indices) == len([e for e in entries if "1" in e.name[1:]])
+        assert "f1" in matcher.results
+
+    def test_fold(self):
+        assert fold("ABC\nDef") == "abc\ndef"
+        assert fold("İSTANBUL\nREADME") == "İstanbul\nreadme"
+        assert len(fold("Straße İİ")) == len("Straße İİ")
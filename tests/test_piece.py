@@ -0,0 +1,53 @@
+import os
+
+from pi import piece
+from pi.piece import PieceTable
+
+
+class TestPiece():
+    def test_lines(self, monkeypatch):
+        monkeypatch.setattr(piece, "CHUNK", 5)
+        table = PieceTable(b"one\ntwo\nthree\n\nfour")
+        assert [table.line_offset(i) for i in range(6)] == [0, 4, 8, 14, 15, None]
+        assert table.line_of(9) == 2
+        assert table.line_count() == 5
+
+    def test_edits(self):
+        table = PieceTable(b"one\ntwo\n")
+        for i, c in enumerate(b"abc"):
+            table.insert(4 + i, bytes([c]))
+        assert table.read() == b"one\nabctwo\n"
+        assert len(table.pieces) == 3
+        table.delete(2, 5)
+        assert table.read() == b"onbctwo\n"
+        assert table.line_offset(1) == 8
+        assert table.read(2, 4) == b"bc"
+
+    def test_undo(self):
+        table = PieceTable(b"text")
+        table.insert(4, b"!")
+        table.insert(5, b"?")
+        table.delete(0, 1)
+        table.delete(0, 1)
+        assert table.read() == b"xt!?"
+        assert table.undo() == 0
+        assert table.read() == b"text!?"
+        assert table.undo() == 4
+        assert table.read() == b"text"
+        assert table.undo() is None
+        assert table.redo() == 4
+        assert table.read() == b"text!?"
+        table.insert(0, b">")
+        assert table.redo() is None
+
+    def test_save(self):
+        path = f"piece-{os.getpid()}"
+        with open(path, "wb") as file:
+            file.write(b"a\n" * 1000)
+        table = PieceTable.open(path)
+        table.insert(0, b"start\n")
+        table.delete(len(table) - 2, len(table))
+        table.save(path)
+        with open(path, "rb") as file:
+            assert file.read() == b"start\n" + b"a\n" * 999
+        os.remove(path)
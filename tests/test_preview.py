@@ -0,0 +1,58 @@
+import os
+import pytest
+import shutil
+
+from pi import preview
+from pi.preview import Previews, hexdump, render
+
+
+@pytest.fixture()
+def folder():
+    os.makedirs("folder/sub")
+    with open("folder/text", "w") as file:
+        file.write("".join(f"line {i}\n" for i in range(1000)))
+    with open("folder/binary", "wb") as file:
+        file.write(b"\x7fELF\0\0" + bytes(range(256)))
+    open("folder/empty", "w").close()
+    yield "folder"
+    shutil.rmtree("folder")
+
+
+class TestPreview():
+    def test_render(self, folder):
+        assert render("folder/text", lines=3) == "line 0\nline 1\nline 2"
+        assert render("folder/text", limit=10) == "line 0\nlin"
+        assert render("folder/empty") == ""
+        binary = b"\x7fELF\0\0" + bytes(range(10))
+        assert render("folder/binary", lines=1) == hexdump(binary)
+        summary = "4 entries: 1 folders, 3 files\n\nbinary\nempty\nsub/\ntext"
+        assert render("folder") == summary
+        assert "No such file" in render("folder/missing")
+
+    def test_hexdump(self):
+        assert hexdump(b"AB\n") == "00000000  41 42 0a" + " " * 40 + " AB."
+
+    def test_previews(self, folder):
+        previews = Previews(capacity=100, lines=5)
+        keys = [(f"folder/{name}", None, None) for name in ("text", "empty", "sub")]
+        previews.request(keys)
+        assert {previews.results.get(timeout=5) for _ in keys} == set(keys)
+        assert previews.get(keys[0]) == "line 0\nline 1\nline 2\nline 3\nline 4"
+        previews.put(("big", None, None), "x" * 50)
+        assert previews.get(keys[2]) is None
+        assert previews.get(keys[0]) is not None
+        assert previews.size <= 100
+
+    def test_failure(self, folder, monkeypatch):
+        def render(path, limit, lines):
+            if path.endswith("text"):
+                raise ValueError("mmap length is greater than file size")
+            return path
+
+        monkeypatch.setattr(preview, "render", render)
+        previews = Previews()
+        keys = [("folder/text", None, None), ("folder/empty", None, None)]
+        previews.request(keys)
+        assert {previews.results.get(timeout=5) for _ in keys} == set(keys)
+        assert previews.get(keys[0]).startswith("Cannot preview")
+        assert previews.get(keys[1]) == "folder/empty"
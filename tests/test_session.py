@@ -0,0 +1,63 @@
+import os
+import shutil
+
+from pi import session
+from pi.core import Entry
+
+
+class TestSession():
+    def test_roundtrip(self):
+        tabs = [
+            {"dir": "/a", "active": "file", "selection": ["file"], "top": 0},
+            {"dir": "/b"},
+        ]
+        assert session.decode(session.encode(tabs, 1)) == (tabs, 1)
+
+    def test_listing(self):
+        entry = Entry("file", "file", False, False, False, 3, 1700000000.25, 42)
+        text = session.encode_listing("/a", [entry])
+        assert session.decode_listing("/a", text) == [entry]
+        assert session.decode_listing("/b", text) is None
+        assert session.decode_listing("/a", "{") is None
+
+    def test_legacy(self):
+        assert session.decode("/a\n/b\n") == ([{"dir": "/a"}, {"dir": "/b"}], 0)
+
+    def test_writer(self):
+        path = f"state-{os.getpid()}"
+        writer = session.Writer(path)
+        for i in range(10):
+            writer.save([{"dir": f"/{i}"}])
+        writer.flush()
+        assert session.load(path) == ([{"dir": "/9"}], 0)
+        os.remove(path)
+
+    def test_writer_listings(self):
+        root = f"listings-{os.getpid()}"
+        entries = [Entry(name, "file", False, False, False, 0, 0, 0) for name in "abc"]
+        writer = session.Writer(os.path.join(root, "state"), root, rows=2)
+        writer.save([{"dir": "/a"}], 0, {"/a": entries[:2], "/b": entries})
+        writer.flush()
+        assert session.load_listing("/a", root) == entries[:2]
+        assert session.load_listing("/b", root) is None
+        path = session.listing_path("/a", root)
+        os.utime(path, ns=(0, 0))
+        writer.save([{"dir": "/a"}], 0, {"/a": writer.written["/a"]})
+        writer.flush()
+        assert path.stat().st_mtime_ns == 0
+        writer.save([], 0, {})
+        writer.flush()
+        assert not path.exists()
+        shutil.rmtree(root)
+
+    def test_hibernating(self):
+        live = [("a", 10), ("b", 10), ("c", 10), ("d", 10), ("e", 10)]
+        assert session.hibernating(live, "e", 2, 1000) == ["a", "b", "c"]
+        assert session.hibernating(live, "a", 2, 1000) == ["b", "c", "d"]
+        assert session.hibernating(live, "e", 10, 25) == ["a", "b", "c"]
+        assert session.hibernating(live, "e", 10, 1000) == []
+
+    def test_hibernated_snapshot(self):
+        snapshot = {"dir": "/a", "active": "f", "selection": ["f", "g"], "top": 7,
+                    "sort": {"mode": "size", "reverse": True, "dirs_first": False}}
+        assert session.decode(session.encode([snapshot], 0)) == ([snapshot], 0)
@@ -0,0 +1,58 @@
+import os
+import pytest
+import shutil
+
+from pi.transfer import copy
+
+
+@pytest.fixture()
+def folder():
+    os.makedirs("folder/source/nested")
+    with open("folder/source/nested/data", "wb") as file:
+        file.write(os.urandom(1 << 20))
+    os.chmod("folder/source/nested/data", 0o750)
+    os.utime("folder/source/nested/data", (1000000000, 1000000000))
+    os.symlink("nested/data", "folder/source/link")
+    yield
+    shutil.rmtree("folder")
+
+
+class TestTransfer():
+    def test_copy(self, folder):
+        done = {"files": 0, "bytes": 0}
+
+        def progress(files=0, bytes=0):
+            done["files"] += files
+            done["bytes"] += bytes
+
+        copy("folder/source", "folder/target", progress)
+        with open("folder/source/nested/data", "rb") as a:
+            with open("folder/target/nested/data", "rb") as b:
+                assert a.read() == b.read()
+        info = os.stat("folder/target/nested/data")
+        assert info.st_mode & 0o777 == 0o750
+        assert info.st_mtime == 1000000000
+        assert os.readlink("folder/target/link") == "nested/data"
+        assert done == {"files": 4, "bytes": 1 << 20}
+
+    def test_copy_file(self, folder):
+        copy("folder/source/nested/data", "folder/data")
+        assert os.path.getsize("folder/data") == 1 << 20
+        with pytest.raises(FileExistsError):
+            copy("folder/source/nested/data", "folder/data")
+
+    def test_cancel(self, folder):
+        def progress(files=0, bytes=0):
+            if bytes:
+                raise KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            copy("folder/source/nested/data", "folder/data", progress)
+        assert not os.path.exists("folder/data")
+        with pytest.raises(KeyboardInterrupt):
+            copy("folder/source", "folder/target", progress)
+        assert not os.path.exists("folder/target")
+        open("folder/data", "w").close()
+        with pytest.raises(FileExistsError):
+            copy("folder/source/nested/data", "folder/data", progress)
+        assert os.path.exists("folder/data")
@@ -0,0 +1,58 @@
+import os
+import pytest
+import shutil
+
+from pi.usage import Usage
+
+
+@pytest.fixture()
+def folder():
+    os.makedirs("folder/a/nested")
+    os.mkdir("folder/b")
+    with open("folder/a/nested/data", "wb") as file:
+        file.write(b"x" * 65536)
+    os.link("folder/a/nested/data", "folder/b/data")
+    open("folder/b/empty", "w").close()
+    yield "folder"
+    shutil.rmtree("folder")
+
+
+def collect(scan):
+    results = {}
+    while (result := scan.results.get(timeout=5)) is not None:
+        name, size, files = result
+        results[name] = size, files
+    return results
+
+
+class TestUsage():
+    def test_scan(self, folder):
+        usage = Usage(workers=2)
+        results = collect(usage.scan(folder, ["a", "b"]))
+        assert results["a"][1] + results["b"][1] == 2
+        data = os.stat("folder/a/nested/data").st_blocks * 512
+        assert results["a"][0] + results["b"][0] >= data
+        assert min(results["a"][0], results["b"][0]) < data
+
+    def test_cache(self, folder):
+        usage = Usage(workers=2)
+        collect(usage.scan(folder, ["a"]))
+        node = usage.nodes[os.path.join(folder, "a", "nested")]
+        collect(usage.scan(folder, ["a"]))
+        assert usage.nodes[os.path.join(folder, "a", "nested")] is node
+        os.mkdir("folder/a/nested/new")
+        assert collect(usage.scan(folder, ["a"]))["a"][1] == 1
+        assert usage.nodes[os.path.join(folder, "a", "nested")] is not node
+
+    def test_capacity(self, folder):
+        usage = Usage(workers=2, capacity=2)
+        assert collect(usage.scan(folder, ["a", "b"]))
+        assert len(usage.nodes) == 2
+
+    def test_failure(self, folder, monkeypatch):
+        usage = Usage(workers=2)
+        monkeypatch.setattr(usage, "node", lambda path: 1 / 0)
+        assert collect(usage.scan(folder, ["a", "b"])) == {"a": (0, 0), "b": (0, 0)}
+
+    def test_empty(self, folder):
+        assert collect(Usage().scan(folder, [])) == {}